@@ -3,51 +3,119 @@ import asyncio
 from datetime import datetime
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from concurrent.futures import ThreadPoolExecutor
+import threading
 import os
-import time
+import sys
+import atexit
+
+SYSTEM_PROMPT_PREFIX = (
+    "You are a helpful coding assistant that can analyze Python code.\n"
+    "You have access to code analysis tools and can help users understand code structure.\n"
+    "Current context:\n"
+)
+
+# Launch the code analyzer with the interpreter running this app
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'code_analyzer', 'server.py')]
+)
+
+# Seconds to wait for a sampling reply before giving up
+ASK_TIMEOUT = 60
+
+# Reconnect backoff bounds, in seconds
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 30
+
+# Seconds close() waits for the client loop to shut the session down
+CLOSE_TIMEOUT = 5
+
 class AIAssistant:
     def __init__(self):
         self.session = None
         self.loop = asyncio.new_event_loop()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)
         self.initialized = False
+        # get_context result, reused until the session changes
+        self._context_cache = None
+        self._system_prompt = None
+        self._context_version = 0
+        self._cached_version = -1
+        # Set (on the client loop) to close the session
+        self._closed = None
+        self._closing = False
         self._start_client()
+        atexit.register(self.close)
     
     def _start_client(self):
-        self.thread_pool.submit(self._run_async_client)
+        # Run the loop forever on its own thread so the MCP session keeps
+        # being serviced between Streamlit reruns
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._init_mcp(), self.loop)
     
-    def _run_async_client(self):
+    def _run_loop(self):
         asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self._init_mcp())
+        self.loop.run_forever()
+    
+    def close(self):
+        """Close the MCP session and stop reconnecting"""
+        self._closing = True
+        if self._closed is not None:
+            self.loop.call_soon_threadsafe(self._closed.set)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(CLOSE_TIMEOUT)
     
     async def _init_mcp(self):
-        server_params = StdioServerParameters(
-            command="/Users/aviz/my-first-mcp/.venv/bin/python",
-            args=["/Users/aviz/my-first-mcp/src/code_analyzer/server.py"]
-        )
-        
-        try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.session = session
-                    await session.initialize()
-                    self.initialized = True
-                    
-                    while True:
-                        await asyncio.sleep(0.1)
-        except Exception as e:
-            print(f"Connection error: {str(e)}")
+        self._closed = asyncio.Event()
+        delay = RECONNECT_MIN_DELAY
+        while not self._closing:
+            try:
+                async with stdio_client(SERVER_PARAMS) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        self.session = session
+                        await session.initialize()
+                        # New server process, any cached context is stale
+                        self._context_version += 1
+                        # Prefetch it now so the first question skips the round-trip
+                        try:
+                            await self._get_context()
+                        except Exception as e:
+                            print(f"Context prefetch failed: {str(e)}")
+                        self.initialized = True
+                        delay = RECONNECT_MIN_DELAY
+                        
+                        # Park until close(); a dropped connection raises out of here
+                        await self._closed.wait()
+            except Exception as e:
+                print(f"Connection error: {str(e)}")
+            # Make ask() fail fast until we are reconnected
+            self.session = None
             self.initialized = False
-            await asyncio.sleep(5)
-            await self._init_mcp()
+            if self._closing:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        # Session is closed, let the loop thread exit so close() can join it
+        self.loop.stop()
+    
+    async def _get_context(self):
+        """Return the analyzer context, calling the server only when it changed"""
+        if self._cached_version != self._context_version:
+            self._context_cache = await self.session.call_tool(
+                "get_context",
+                arguments={}
+            )
+            self._system_prompt = SYSTEM_PROMPT_PREFIX + "\n".join(
+                item.text for item in self._context_cache.content
+                if getattr(item, 'text', None)
+            )
+            self._cached_version = self._context_version
+        return self._context_cache
     
     async def _ask_ai(self, user_message: str):
         # Get current context first
-        context = await self.session.call_tool(
-            "get_context",
-            arguments={}
-        )
+        await self._get_context()
         
         # Create sampling request with context
         request = {
@@ -56,10 +124,7 @@ class AIAssistant:
                     "role": "system",
                     "content": {
                         "type": "text",
-                        "text": """You are a helpful coding assistant that can analyze Python code.
-                                 You have access to code analysis tools and can help users understand code structure.
-                                 Current context:
-                                 """ + str(context)
+                        "text": self._system_prompt
                     }
                 },
                 {
@@ -75,7 +140,10 @@ class AIAssistant:
         }
         
         # Send sampling request using the sampling API
-        response = await self.session.sampling.create_message(request)
+        response = await asyncio.wait_for(
+            self.session.sampling.create_message(request),
+            ASK_TIMEOUT
+        )
         
         # Extract text from response
         if response and hasattr(response, 'content'):
@@ -86,16 +154,23 @@ class AIAssistant:
         return None
     
     def ask(self, question: str):
+        """Schedule a question on the client loop; returns its future, or None if not connected"""
         if not self.session or not self.initialized:
-            return "System not ready, please wait..."
+            return None
         
+        return asyncio.run_coroutine_threadsafe(
+            self._ask_ai(question),
+            self.loop
+        )
+    
+    @staticmethod
+    def answer(future) -> str:
+        """Turn a finished ask() future into the reply shown to the user"""
         try:
-            future = asyncio.run_coroutine_threadsafe(
-                self._ask_ai(question),
-                self.loop
-            )
-            result = future.result(timeout=10)
+            result = future.result()
             return result or "Sorry, I couldn't process that request."
+        except asyncio.TimeoutError:
+            return "Error: the assistant took too long to respond."
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -103,56 +178,56 @@ class AIAssistant:
 if 'assistant' not in st.session_state:
     st.session_state.assistant = AIAssistant()
     st.session_state.messages = []
+    st.session_state.pending = None
 
-# App title and styling
+# App title
 st.set_page_config(page_title="AI File Assistant", page_icon="🤖")
-st.markdown("""
-    <style>
-        .chat-message {
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin-bottom: 1rem;
-        }
-        .user-message {
-            background-color: #e6f3ff;
-        }
-        .assistant-message {
-            background-color: #f0f2f6;
-        }
-    </style>
-""", unsafe_allow_html=True)
 
 st.title('🤖 AI File Assistant')
 
-# Connection status
-if not st.session_state.assistant.initialized:
+# Connection status, polled in a fragment so only the banner reruns while waiting
+@st.fragment(run_every="1s")
+def connection_status():
+    if st.session_state.assistant.initialized:
+        # Connected - rerun the whole app once to enable the input form
+        st.rerun()
     st.warning("⏳ Connecting to system...")
 
+if not st.session_state.assistant.initialized:
+    connection_status()
+
 # Chat interface
 st.subheader("Chat")
 
 # Display chat history
 for message in st.session_state.messages:
-    with st.container():
-        if message["role"] == "user":
-            st.markdown(f"""
-                <div class="chat-message user-message">
-                    <b>You:</b> {message["content"]}
-                </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-                <div class="chat-message assistant-message">
-                    <b>Assistant:</b> {message["content"]}
-                </div>
-            """, unsafe_allow_html=True)
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+# Pending reply, polled so the script thread never blocks on the answer
+@st.fragment(run_every="0.5s")
+def pending_reply():
+    future = st.session_state.pending
+    if future.done():
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": AIAssistant.answer(future)
+        })
+        st.session_state.pending = None
+        st.rerun()
+    with st.chat_message("assistant"):
+        st.markdown("_Thinking..._")
+
+if st.session_state.pending is not None:
+    pending_reply()
 
 # Input form
 with st.form("chat_input", clear_on_submit=True):
     user_input = st.text_area("Your message:", height=100)
     submitted = st.form_submit_button(
         "Send", 
-        disabled=not st.session_state.assistant.initialized,
+        disabled=(not st.session_state.assistant.initialized
+                  or st.session_state.pending is not None),
         use_container_width=True
     )
     
@@ -163,25 +238,20 @@ with st.form("chat_input", clear_on_submit=True):
             "content": user_input
         })
         
-        # Get AI response
-        response = st.session_state.assistant.ask(user_input)
-        
-        # Add assistant response to history
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response
-        })
+        # Ask in the background; pending_reply() picks up the answer
+        future = st.session_state.assistant.ask(user_input)
+        if future is None:
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": "System not ready, please wait..."
+            })
+        else:
+            st.session_state.pending = future
         
         # Rerun to update chat
         st.rerun()
 
-# Auto-refresh for connection status
-if not st.session_state.assistant.initialized:
-    time.sleep(1)
-    st.rerun()
-
 if __name__ == "__main__":
-    import sys
     import streamlit.web.bootstrap as bootstrap
     
     # Run Streamlit app
@@ -1,6 +1,6 @@
 import datetime
 from datetime import timedelta
-import pytz
+from zoneinfo import ZoneInfo
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 from mcp.types import (
@@ -10,12 +10,19 @@ from pydantic import AnyUrl
 from typing import Any, Sequence
 import logging
 import sys
+import asyncio
+import heapq
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+import httplib2
 import os.path
-import json
+import orjson
 
 # Configure logging
 logging.basicConfig(
@@ -33,10 +40,36 @@ server = Server("calendar-assistant")
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly',
           'https://www.googleapis.com/auth/calendar.events']
 
+UTC = datetime.timezone.utc
+
+# Partial response for events().list - only the event fields we display
+EVENT_LIST_FIELDS = 'items(id,summary,start,end)'
+EVENT_PAGE_FIELDS = EVENT_LIST_FIELDS + ',nextPageToken'
+
+def _rfc3339(dt):
+    """Format an aware UTC datetime the way the Calendar API expects"""
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts RFC 3339 timestamps, including 'Z', natively
+    _parse_time = datetime.datetime.fromisoformat
+else:
+    def _parse_time(value):
+        """Parse an RFC 3339 timestamp from the API"""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.datetime.fromisoformat(value)
+
+CREDENTIALS_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'credentials.json')
+)
+
+def _token_path():
+    return os.path.join(os.path.dirname(CREDENTIALS_PATH), 'token.json')
+
 def verify_credentials():
-    creds_path = os.path.join(os.path.dirname(__file__), '..', '..', 'credentials.json')
-    abs_path = os.path.abspath(creds_path)
-    logger.debug(f"Looking for credentials at: {abs_path}")
+    abs_path = CREDENTIALS_PATH
+    logger.debug("Looking for credentials at: %s", abs_path)
     
     if not os.path.exists(abs_path):
         logger.error(f"credentials.json not found at {abs_path}")
@@ -46,32 +79,83 @@ def verify_credentials():
         )
     
     try:
-        with open(abs_path) as f:
-            creds_data = json.load(f)
+        with open(abs_path, 'rb') as f:
+            creds_data = orjson.loads(f.read())
             if 'installed' not in creds_data:
                 logger.error("Invalid credentials.json format - missing 'installed' key")
                 raise ValueError("Invalid credentials.json format")
             logger.debug("Found valid credentials.json")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in credentials.json: {str(e)}")
         raise ValueError("credentials.json is not valid JSON")
     
     return abs_path
 
+# Cached service so tool calls don't re-read credentials and rebuild the client
+_SERVICE_CACHE = {"svc": None, "creds": None, "token_json": None, "tz": None}
+
+# Refresh tokens this long before they expire
+TOKEN_REFRESH_SKEW = timedelta(minutes=5)
+
+def _needs_refresh(creds):
+    if not creds.valid:
+        return True
+    if not creds.refresh_token:
+        return False
+    # google-auth keeps expiry as naive UTC
+    now = datetime.datetime.now(UTC).replace(tzinfo=None)
+    return creds.expiry is not None and creds.expiry - now < TOKEN_REFRESH_SKEW
+
+def _save_token(creds):
+    """Write token.json only when the serialized credentials changed"""
+    token_json = creds.to_json()
+    if token_json == _SERVICE_CACHE["token_json"]:
+        return
+    logger.debug("Saving token to %s", _token_path())
+    with open(_token_path(), 'w') as token:
+        token.write(token_json)
+    _SERVICE_CACHE["token_json"] = token_json
+
+_SERVICE_LOCK = threading.Lock()
+
 def get_calendar_service():
+    with _SERVICE_LOCK:
+        return _load_service()
+
+async def _calendar_service():
+    """Cached service, refreshing or building it on a worker thread when needed"""
+    svc = _SERVICE_CACHE["svc"]
+    creds = _SERVICE_CACHE["creds"]
+    if svc is not None and creds is not None and not _needs_refresh(creds):
+        return svc
+    return await asyncio.to_thread(get_calendar_service)
+
+def _load_service():
+    svc = _SERVICE_CACHE["svc"]
+    creds = _SERVICE_CACHE["creds"]
+    if svc is not None and creds is not None:
+        if not _needs_refresh(creds):
+            return svc
+        if creds.refresh_token:
+            logger.debug("Refreshing cached token before it expires")
+            creds.refresh(Request())
+            _save_token(creds)
+            return svc
+    
     logger.debug("Starting calendar service initialization")
     creds = None
     creds_path = verify_credentials()
-    token_path = os.path.join(os.path.dirname(creds_path), 'token.json')
-    logger.debug(f"Token path: {token_path}")
+    token_path = _token_path()
+    logger.debug("Token path: %s", token_path)
     
     if os.path.exists(token_path):
         logger.debug("Found existing token.json")
         creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+        _SERVICE_CACHE["token_json"] = creds.to_json()
     
-    if not creds or not creds.valid:
-        logger.debug("Credentials invalid or expired, starting OAuth flow")
-        if creds and creds.expired and creds.refresh_token:
+    if not creds or _needs_refresh(creds):
+        logger.debug("Credentials invalid or expiring, starting OAuth flow")
+        if creds and creds.refresh_token:
             logger.debug("Attempting to refresh expired token")
             creds.refresh(Request())
         else:
@@ -93,618 +177,735 @@ def get_calendar_service():
                 logger.error(f"OAuth flow error: {str(e)}", exc_info=True)
                 raise
         
-        logger.debug(f"Saving new token to {token_path}")
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
+        _save_token(creds)
     
     logger.debug("Building calendar service")
-    return build('calendar', 'v3', credentials=creds)
+    # Use the discovery document bundled with google-api-python-client
+    svc = build('calendar', 'v3', credentials=creds,
+                static_discovery=True, cache_discovery=False)
+    _SERVICE_CACHE["svc"] = svc
+    _SERVICE_CACHE["creds"] = creds
+    return svc
 
 # Resource handlers
+# Listings are static, so they are built once at import
+RESOURCES = [
+    Resource(
+        uri=AnyUrl("calendar://events/today"),
+        name="Today's Events",
+        mimeType="application/json",
+        description="Get today's calendar events"
+    )
+]
+
 @server.list_resources()
 async def list_resources() -> list[Resource]:
     """List available calendar resources."""
-    return [
-        Resource(
-            uri=AnyUrl("calendar://events/today"),
-            name="Today's Events",
-            mimeType="application/json",
-            description="Get today's calendar events"
-        )
-    ]
+    return RESOURCES
 
 @server.read_resource()
 async def read_resource(uri: AnyUrl) -> str:
     """Read calendar data."""
-    logger.debug(f"Reading resource: {uri}")
+    logger.debug("Reading resource: %s", uri)
     try:
-        service = get_calendar_service()
+        service = await _calendar_service()
         logger.debug("Calendar service initialized")
-        now = datetime.datetime.utcnow().isoformat() + 'Z'
+        now = datetime.datetime.now(UTC)
         
         if str(uri) == "calendar://events/today":
             logger.debug("Fetching today's events")
-            end = (datetime.datetime.utcnow() + timedelta(days=1)).isoformat() + 'Z'
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                timeMax=end,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
-            logger.debug(f"Found {len(events)} events")
+            events = await _list_all_events(
+                service,
+                timeMin=_rfc3339(now),
+                timeMax=_rfc3339(now + timedelta(days=1))
+            )
+            logger.debug("Found %d events", len(events))
             
-            return json.dumps([{
+            return orjson.dumps([{
                 'summary': event.get('summary', 'No title'),
                 'start': event['start'].get('dateTime', event['start'].get('date')),
                 'end': event['end'].get('dateTime', event['end'].get('date'))
-            } for event in events], indent=2)
+            } for event in events], option=orjson.OPT_INDENT_2).decode()
     except Exception as e:
         logger.error(f"Error reading calendar: {str(e)}", exc_info=True)
         raise
 
 # Tool handlers
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="quick_add",
-            description="Quickly add an event",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "Event description (e.g., 'Meeting with John tomorrow at 3pm')"
-                    },
-                    "all_day": {
-                        "type": "boolean",
-                        "description": "Whether this is an all-day event",
-                        "default": False
-                    }
+TOOLS = [
+    Tool(
+        name="quick_add",
+        description="Quickly add an event",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Event description (e.g., 'Meeting with John tomorrow at 3pm')"
                 },
-                "required": ["text"]
-            }
-        ),
-        Tool(
-            name="next",
-            description="Show next meeting",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="cancel_next",
-            description="Cancel your next meeting",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "notify": {
-                        "type": "boolean",
-                        "description": "Notify attendees",
-                        "default": True
-                    }
+                "all_day": {
+                    "type": "boolean",
+                    "description": "Whether this is an all-day event",
+                    "default": False
+                }
+            },
+            "required": ["text"]
+        }
+    ),
+    Tool(
+        name="next",
+        description="Show next meeting",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="cancel_next",
+        description="Cancel your next meeting",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "notify": {
+                    "type": "boolean",
+                    "description": "Notify attendees",
+                    "default": True
                 }
             }
-        ),
-        Tool(
-            name="free_today",
-            description="Find free time slots today",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "min_duration": {
-                        "type": "integer",
-                        "description": "Minimum duration in minutes",
-                        "default": 30
-                    }
+        }
+    ),
+    Tool(
+        name="free_today",
+        description="Find free time slots today",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "min_duration": {
+                    "type": "integer",
+                    "description": "Minimum duration in minutes",
+                    "default": 30
                 }
             }
-        ),
-        Tool(
-            name="list_events",
-            description="List events for a specific date",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "date": {
-                        "type": "string",
-                        "description": "Date in YYYY-MM-DD format (default: today)",
-                        "pattern": "^\\d{4}-\\d{2}-\\d{2}$"
-                    }
+        }
+    ),
+    Tool(
+        name="list_events",
+        description="List events for a specific date",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date in YYYY-MM-DD format (default: today)",
+                    "pattern": "^\\d{4}-\\d{2}-\\d{2}$"
                 }
             }
-        ),
-        Tool(
-            name="delete_event",
-            description="Delete a single event",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "event_id": {
-                        "type": "string",
-                        "description": "Event ID to delete"
-                    },
-                    "notify": {
-                        "type": "boolean",
-                        "description": "Notify attendees",
-                        "default": True
-                    }
+        }
+    ),
+    Tool(
+        name="delete_event",
+        description="Delete a single event",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "Event ID to delete"
                 },
-                "required": ["event_id"]
-            }
-        ),
-        Tool(
-            name="delete_events",
-            description="Delete multiple events",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "event_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of event IDs to delete"
-                    },
-                    "notify": {
-                        "type": "boolean",
-                        "description": "Notify attendees",
-                        "default": True
-                    }
+                "notify": {
+                    "type": "boolean",
+                    "description": "Notify attendees",
+                    "default": True
+                }
+            },
+            "required": ["event_id"]
+        }
+    ),
+    Tool(
+        name="delete_events",
+        description="Delete multiple events",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "event_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of event IDs to delete"
                 },
-                "required": ["event_ids"]
-            }
-        ),
-        Tool(
-            name="edit_event",
-            description="Edit an existing event",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "event_id": {
-                        "type": "string",
-                        "description": "Event ID to edit"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "New event title"
-                    },
-                    "start_time": {
-                        "type": "string",
-                        "description": "New start time (ISO format)"
-                    },
-                    "end_time": {
-                        "type": "string",
-                        "description": "New end time (ISO format)"
-                    },
-                    "notify": {
-                        "type": "boolean",
-                        "description": "Notify attendees",
-                        "default": True
-                    }
+                "notify": {
+                    "type": "boolean",
+                    "description": "Notify attendees",
+                    "default": True
+                }
+            },
+            "required": ["event_ids"]
+        }
+    ),
+    Tool(
+        name="edit_event",
+        description="Edit an existing event",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "Event ID to edit"
                 },
-                "required": ["event_id"]
-            }
-        ),
-        Tool(
-            name="bulk_add",
-            description="Add multiple events at once",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "events": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "title": {
-                                    "type": "string",
-                                    "description": "Event title"
-                                },
-                                "start_time": {
-                                    "type": "string",
-                                    "description": "Start time (ISO format or YYYY-MM-DD for all-day)"
-                                },
-                                "end_time": {
-                                    "type": "string",
-                                    "description": "End time (ISO format or YYYY-MM-DD for all-day)"
-                                },
-                                "all_day": {
-                                    "type": "boolean",
-                                    "description": "Whether this is an all-day event",
-                                    "default": False
-                                }
+                "title": {
+                    "type": "string",
+                    "description": "New event title"
+                },
+                "start_time": {
+                    "type": "string",
+                    "description": "New start time (ISO format)"
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "New end time (ISO format)"
+                },
+                "notify": {
+                    "type": "boolean",
+                    "description": "Notify attendees",
+                    "default": True
+                }
+            },
+            "required": ["event_id"]
+        }
+    ),
+    Tool(
+        name="bulk_add",
+        description="Add multiple events at once",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {
+                                "type": "string",
+                                "description": "Event title"
+                            },
+                            "start_time": {
+                                "type": "string",
+                                "description": "Start time (ISO format or YYYY-MM-DD for all-day)"
                             },
-                            "required": ["title", "start_time"]
-                        }
+                            "end_time": {
+                                "type": "string",
+                                "description": "End time (ISO format or YYYY-MM-DD for all-day)"
+                            },
+                            "all_day": {
+                                "type": "boolean",
+                                "description": "Whether this is an all-day event",
+                                "default": False
+                            }
+                        },
+                        "required": ["title", "start_time"]
                     }
+                }
+            },
+            "required": ["events"]
+        }
+    ),
+    Tool(
+        name="search_events",
+        description="Search events by title",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (title)"
                 },
-                "required": ["events"]
-            }
-        ),
-        Tool(
-            name="search_events",
-            description="Search events by title",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (title)"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 5
-                    },
-                    "days_ahead": {
-                        "type": "integer",
-                        "description": "Number of days to look ahead",
-                        "default": 30
-                    }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 5
                 },
-                "required": ["query"]
-            }
-        )
-    ]
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to look ahead",
+                    "default": 30
+                }
+            },
+            "required": ["query"]
+        }
+    )
+]
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    service = get_calendar_service()
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    return TOOLS
+
+async def _calendar_timezone(service):
+    """IANA timezone of the user's calendar, fetched once per process"""
+    if _SERVICE_CACHE["tz"] is None:
+        setting = await _execute(service.settings().get(setting='timezone'))
+        _SERVICE_CACHE["tz"] = setting['value']
+    return _SERVICE_CACHE["tz"]
+
+async def _next_event(service):
+    """Return the next upcoming event, or None"""
+    events = (await _execute(service.events().list(
+        calendarId='primary',
+        timeMin=_rfc3339(datetime.datetime.now(UTC)),
+        maxResults=1,
+        singleEvents=True,
+        orderBy='startTime',
+        fields=EVENT_LIST_FIELDS
+    ))).get('items', [])
+    return events[0] if events else None
+
+_thread_local = threading.local()
+
+def _thread_http():
+    """Authorized Http for the calling thread - httplib2.Http is not thread-safe"""
+    creds = _SERVICE_CACHE["creds"]
+    if getattr(_thread_local, 'creds', None) is not creds:
+        _thread_local.creds = creds
+        _thread_local.http = AuthorizedHttp(creds, http=httplib2.Http())
+    return _thread_local.http
+
+# Small dedicated pool: each worker keeps one keep-alive connection to Google
+_API_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="calendar-api")
+
+async def _execute(request):
+    """Execute an API request on a worker thread so the event loop stays free"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _API_EXECUTOR, lambda: request.execute(http=_thread_http())
+    )
+
+# Largest page events().list allows
+EVENTS_PAGE_SIZE = 2500
+
+async def _list_all_events(service, **params):
+    """List events in start-time order, following nextPageToken across pages"""
+    events = []
+    resource = service.events()
+    request = resource.list(
+        calendarId='primary',
+        singleEvents=True,
+        orderBy='startTime',
+        maxResults=EVENTS_PAGE_SIZE,
+        fields=EVENT_PAGE_FIELDS,
+        **params
+    )
+    while request is not None:
+        response = await _execute(request)
+        events.extend(response.get('items', []))
+        request = resource.list_next(request, response)
+    return events
+
+# Google rejects batches with more than 50 sub-requests
+BATCH_LIMIT = 50
+
+async def _execute_batch(service, requests):
+    """Run requests as batch HTTP calls; returns (response, exception) pairs in order"""
+    outcomes = [None] * len(requests)
+    
+    def callback(request_id, response, exception):
+        outcomes[int(request_id)] = (response, exception)
     
-    if name == "quick_add":
-        event = service.events().quickAdd(
+    for offset in range(0, len(requests), BATCH_LIMIT):
+        chunk = range(offset, min(offset + BATCH_LIMIT, len(requests)))
+        batch = service.new_batch_http_request(callback=callback)
+        for i in chunk:
+            batch.add(requests[i], request_id=str(i))
+        try:
+            await _execute(batch)
+        except Exception as e:
+            # Transport/auth failure: report it per request, keep earlier chunks' outcomes
+            logger.error(f"Batch request failed: {str(e)}")
+            for i in chunk:
+                if outcomes[i] is None:
+                    outcomes[i] = (None, e)
+    return outcomes
+
+async def _quick_add(service, arguments: Any) -> Sequence[TextContent]:
+    events = service.events()
+    event = await _execute(events.quickAdd(
+        calendarId='primary',
+        text=arguments["text"]
+    ))
+    
+    # If it should be an all-day event, modify it
+    if arguments.get("all_day", False):
+        start_date = event['start'].get('dateTime', event['start'].get('date'))[:10]  # Get YYYY-MM-DD
+        end_date = event['end'].get('dateTime', event['end'].get('date'))[:10]
+    
+        # Patch only the changed fields instead of re-sending the whole event
+        event = await _execute(events.patch(
             calendarId='primary',
-            text=arguments["text"]
-        ).execute()
-        
-        # If it should be an all-day event, modify it
-        if arguments.get("all_day", False):
-            start_date = event['start'].get('dateTime', event['start'].get('date'))[:10]  # Get YYYY-MM-DD
-            end_date = event['end'].get('dateTime', event['end'].get('date'))[:10]
-            
-            event['start'] = {'date': start_date}
-            event['end'] = {'date': end_date}
-            
-            event = service.events().update(
-                calendarId='primary',
-                eventId=event['id'],
-                body=event
-            ).execute()
-        
+            eventId=event['id'],
+            body={'start': {'date': start_date}, 'end': {'date': end_date}}
+        ))
+    
+    return [TextContent(
+        type="text",
+        text=f"✅ Added: {event['summary']}" + 
+             (" (All day)" if arguments.get("all_day", False) else "")
+    )]
+
+async def _next(service, arguments: Any) -> Sequence[TextContent]:
+    event = await _next_event(service)
+    
+    if not event:
+        return [TextContent(type="text", text="No upcoming meetings! 🎉")]
+    
+    start = _parse_time(event['start'].get('dateTime', event['start'].get('date')))
+    
+    return [TextContent(
+        type="text",
+        text=f"Next up: {event['summary']} at {start.strftime('%H:%M')}"
+    )]
+
+async def _cancel_next(service, arguments: Any) -> Sequence[TextContent]:
+    event = await _next_event(service)
+    
+    if not event:
+        return [TextContent(type="text", text="No meetings to cancel! 🎉")]
+    
+    await _execute(service.events().delete(
+        calendarId='primary',
+        eventId=event['id'],
+        sendUpdates='all' if arguments.get('notify', True) else 'none'
+    ))
+    
+    return [TextContent(
+        type="text",
+        text=f"Cancelled: {event['summary']}"
+    )]
+
+async def _free_today(service, arguments: Any) -> Sequence[TextContent]:
+    now = datetime.datetime.now(UTC)
+    end_of_day = now.replace(hour=23, minute=59, second=59)
+    min_duration = timedelta(minutes=arguments.get('min_duration', 30))
+    
+    # Get busy periods
+    body = {
+        "timeMin": now.isoformat(),
+        "timeMax": end_of_day.isoformat(),
+        "items": [{"id": "primary"}]
+    }
+    
+    free_busy = await _execute(service.freebusy().query(
+        body=body,
+        fields='calendars/primary/busy'
+    ))
+    busy = free_busy['calendars']['primary']['busy']
+    
+    if not busy:
         return [TextContent(
             type="text",
-            text=f"✅ Added: {event['summary']}" + 
-                 (" (All day)" if arguments.get("all_day", False) else "")
+            text=f"You're free for the rest of the day! 🎉"
         )]
     
-    elif name == "next":
-        now = datetime.datetime.utcnow()
-        events = service.events().list(
-            calendarId='primary',
-            timeMin=now.isoformat() + 'Z',
-            maxResults=1,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute().get('items', [])
-        
-        if not events:
-            return [TextContent(type="text", text="No upcoming meetings! 🎉")]
-        
-        event = events[0]
-        start = datetime.datetime.fromisoformat(
-            event['start'].get('dateTime', event['start'].get('date')).replace('Z', '+00:00')
+    # Parse each busy period once, then sweep the sorted intervals for gaps
+    intervals = sorted(
+        (_parse_time(period['start']), _parse_time(period['end']))
+        for period in busy
+    )
+    free_slots = []
+    current = now
+    
+    for busy_start, busy_end in intervals:
+        if busy_start - current >= min_duration:
+            free_slots.append(f"• {current.strftime('%H:%M')} - {busy_start.strftime('%H:%M')}")
+        # Overlapping periods must not move the cursor backwards
+        if busy_end > current:
+            current = busy_end
+    
+    if end_of_day - current >= min_duration:
+        free_slots.append(f"• {current.strftime('%H:%M')} - {end_of_day.strftime('%H:%M')}")
+    
+    if not free_slots:
+        return [TextContent(type="text", text="No free slots found for today 😅")]
+    
+    return [TextContent(
+        type="text",
+        text="Free slots today:\n" + "\n".join(free_slots)
+    )]
+
+async def _list_events(service, arguments: Any) -> Sequence[TextContent]:
+    tz_name = await _calendar_timezone(service)
+    tz = ZoneInfo(tz_name)
+    date_str = arguments.get("date", datetime.datetime.now(tz).strftime("%Y-%m-%d"))
+    # Local midnight to midnight in the calendar's own timezone
+    day_start = datetime.datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=tz)
+    day_end = day_start + timedelta(days=1)
+    
+    events = await _list_all_events(
+        service,
+        timeMin=day_start.isoformat(),
+        timeMax=day_end.isoformat(),
+        timeZone=tz_name
+    )
+    if not events:
+        return [TextContent(type="text", text=f"No events found for {date_str}")]
+    
+    formatted_events = []
+    for event in events:
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        formatted_events.append(
+            f"• {start} - {end}\n"
+            f"  {event['summary']}\n"
+            f"  ID: {event['id']}"
         )
-        
-        return [TextContent(
-            type="text",
-            text=f"Next up: {event['summary']} at {start.strftime('%H:%M')}"
-        )]
     
-    elif name == "cancel_next":
-        now = datetime.datetime.utcnow()
-        events = service.events().list(
-            calendarId='primary',
-            timeMin=now.isoformat() + 'Z',
-            maxResults=1,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute().get('items', [])
-        
-        if not events:
-            return [TextContent(type="text", text="No meetings to cancel! 🎉")]
-        
-        event = events[0]
-        service.events().delete(
+    return [TextContent(
+        type="text",
+        text=f"Events for {date_str}:\n\n" + "\n\n".join(formatted_events)
+    )]
+
+async def _delete_event(service, arguments: Any) -> Sequence[TextContent]:
+    try:
+        await _execute(service.events().delete(
             calendarId='primary',
-            eventId=event['id'],
+            eventId=arguments["event_id"],
             sendUpdates='all' if arguments.get('notify', True) else 'none'
-        ).execute()
-        
+        ))
         return [TextContent(
             type="text",
-            text=f"Cancelled: {event['summary']}"
+            text=f"✅ Event {arguments['event_id']} deleted successfully"
         )]
-    
-    elif name == "free_today":
-        now = datetime.datetime.now(pytz.UTC)
-        end_of_day = now.replace(hour=23, minute=59, second=59)
-        min_duration = timedelta(minutes=arguments.get('min_duration', 30))
-        
-        # Get busy periods
-        body = {
-            "timeMin": now.isoformat(),
-            "timeMax": end_of_day.isoformat(),
-            "items": [{"id": "primary"}]
-        }
-        
-        free_busy = service.freebusy().query(body=body).execute()
-        busy = free_busy['calendars']['primary']['busy']
-        
-        if not busy:
-            return [TextContent(
-                type="text",
-                text=f"You're free for the rest of the day! 🎉"
-            )]
-        
-        # Find gaps
-        free_slots = []
-        current = now
-        
-        for period in busy:
-            busy_start = datetime.datetime.fromisoformat(period['start'].replace('Z', '+00:00'))
-            if busy_start - current >= min_duration:
-                free_slots.append(f"• {current.strftime('%H:%M')} - {busy_start.strftime('%H:%M')}")
-            current = datetime.datetime.fromisoformat(period['end'].replace('Z', '+00:00'))
-        
-        if end_of_day - current >= min_duration:
-            free_slots.append(f"• {current.strftime('%H:%M')} - {end_of_day.strftime('%H:%M')}")
-        
-        if not free_slots:
-            return [TextContent(type="text", text="No free slots found for today 😅")]
-        
+    except Exception as e:
         return [TextContent(
             type="text",
-            text="Free slots today:\n" + "\n".join(free_slots)
+            text=f"❌ Failed to delete event: {str(e)}"
         )]
+
+async def _delete_events(service, arguments: Any) -> Sequence[TextContent]:
+    event_ids = arguments["event_ids"]
+    send_updates = 'all' if arguments.get('notify', True) else 'none'
+    events = service.events()
+    outcomes = await _execute_batch(service, [
+        events.delete(
+            calendarId='primary',
+            eventId=event_id,
+            sendUpdates=send_updates
+        )
+        for event_id in event_ids
+    ])
     
-    elif name == "list_events":
-        date_str = arguments.get("date", datetime.datetime.now().strftime("%Y-%m-%d"))
-        date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-        start = date.replace(hour=0, minute=0, second=0).isoformat() + 'Z'
-        end = date.replace(hour=23, minute=59, second=59).isoformat() + 'Z'
-        
-        events_result = service.events().list(
+    results = []
+    for event_id, (_, error) in zip(event_ids, outcomes):
+        if error is None:
+            results.append(f"✅ Event {event_id} deleted successfully")
+        else:
+            results.append(f"❌ Failed to delete event {event_id}: {str(error)}")
+    
+    return [TextContent(
+        type="text",
+        text="\n".join(results)
+    )]
+
+async def _edit_event(service, arguments: Any) -> Sequence[TextContent]:
+    events = service.events()
+    try:
+        event = await _execute(events.get(
             calendarId='primary',
-            timeMin=start,
-            timeMax=end,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
-        if not events:
-            return [TextContent(type="text", text=f"No events found for {date_str}")]
-        
-        formatted_events = []
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            formatted_events.append(
-                f"• {start} - {end}\n"
-                f"  {event['summary']}\n"
-                f"  ID: {event['id']}"
-            )
-        
+            eventId=arguments["event_id"]
+        ))
+    
+        if "title" in arguments:
+            event["summary"] = arguments["title"]
+        if "start_time" in arguments:
+            event["start"]["dateTime"] = arguments["start_time"]
+        if "end_time" in arguments:
+            event["end"]["dateTime"] = arguments["end_time"]
+    
+        updated_event = await _execute(events.update(
+            calendarId='primary',
+            eventId=arguments["event_id"],
+            body=event,
+            sendUpdates='all' if arguments.get('notify', True) else 'none'
+        ))
+    
         return [TextContent(
             type="text",
-            text=f"Events for {date_str}:\n\n" + "\n\n".join(formatted_events)
+            text=f"✅ Event updated:\n"
+                 f"Title: {updated_event['summary']}\n"
+                 f"Start: {updated_event['start'].get('dateTime', updated_event['start'].get('date'))}\n"
+                 f"End: {updated_event['end'].get('dateTime', updated_event['end'].get('date'))}"
         )]
-    
-    elif name == "delete_event":
-        try:
-            service.events().delete(
-                calendarId='primary',
-                eventId=arguments["event_id"],
-                sendUpdates='all' if arguments.get('notify', True) else 'none'
-            ).execute()
-            return [TextContent(
-                type="text",
-                text=f"✅ Event {arguments['event_id']} deleted successfully"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"❌ Failed to delete event: {str(e)}"
-            )]
-    
-    elif name == "delete_events":
-        results = []
-        for event_id in arguments["event_ids"]:
-            try:
-                service.events().delete(
-                    calendarId='primary',
-                    eventId=event_id,
-                    sendUpdates='all' if arguments.get('notify', True) else 'none'
-                ).execute()
-                results.append(f"✅ Event {event_id} deleted successfully")
-            except Exception as e:
-                results.append(f"❌ Failed to delete event {event_id}: {str(e)}")
-        
+    except Exception as e:
         return [TextContent(
             type="text",
-            text="\n".join(results)
+            text=f"❌ Failed to update event: {str(e)}"
         )]
+
+# Default length of bulk_add events without an end_time
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+
+def _event_body(event_data):
+    """Build an events().insert body from a bulk_add entry"""
+    if event_data.get("all_day", False):
+        # For all-day events, use date instead of dateTime
+        start_date = event_data["start_time"][:10]  # Get YYYY-MM-DD
+        end_date = event_data.get("end_time", start_date)[:10]
+        return {
+            'summary': event_data["title"],
+            'start': {'date': start_date},
+            'end': {'date': end_date}
+        }
     
-    elif name == "edit_event":
+    end_time = event_data.get("end_time")
+    if end_time is None:
+        # Only parse start_time when we need to derive the end
+        end_time = (_parse_time(event_data["start_time"]) + DEFAULT_EVENT_DURATION).isoformat()
+    return {
+        'summary': event_data["title"],
+        'start': {'dateTime': event_data["start_time"]},
+        'end': {'dateTime': end_time}
+    }
+
+async def _bulk_add(service, arguments: Any) -> Sequence[TextContent]:
+    results = [None] * len(arguments["events"])
+    requests = []
+    positions = []
+    events = service.events()
+    for i, event_data in enumerate(arguments["events"]):
         try:
-            event = service.events().get(
-                calendarId='primary',
-                eventId=arguments["event_id"]
-            ).execute()
-            
-            if "title" in arguments:
-                event["summary"] = arguments["title"]
-            if "start_time" in arguments:
-                event["start"]["dateTime"] = arguments["start_time"]
-            if "end_time" in arguments:
-                event["end"]["dateTime"] = arguments["end_time"]
-            
-            updated_event = service.events().update(
+            requests.append(events.insert(
                 calendarId='primary',
-                eventId=arguments["event_id"],
-                body=event,
-                sendUpdates='all' if arguments.get('notify', True) else 'none'
-            ).execute()
-            
-            return [TextContent(
-                type="text",
-                text=f"✅ Event updated:\n"
-                     f"Title: {updated_event['summary']}\n"
-                     f"Start: {updated_event['start'].get('dateTime', updated_event['start'].get('date'))}\n"
-                     f"End: {updated_event['end'].get('dateTime', updated_event['end'].get('date'))}"
-            )]
+                body=_event_body(event_data)
+            ))
+            positions.append(i)
         except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"❌ Failed to update event: {str(e)}"
-            )]
-    
-    elif name == "bulk_add":
-        results = []
-        for event_data in arguments["events"]:
-            try:
-                if event_data.get("all_day", False):
-                    # For all-day events, use date instead of dateTime
-                    start_date = event_data["start_time"][:10]  # Get YYYY-MM-DD
-                    end_date = event_data.get("end_time", start_date)[:10]
-                    event = {
-                        'summary': event_data["title"],
-                        'start': {'date': start_date},
-                        'end': {'date': end_date}
-                    }
-                else:
-                    event = {
-                        'summary': event_data["title"],
-                        'start': {'dateTime': event_data["start_time"]},
-                        'end': {'dateTime': event_data.get("end_time", 
-                               # Default to start_time + 1 hour if no end_time
-                               (datetime.datetime.fromisoformat(event_data["start_time"]) + 
-                                timedelta(hours=1)).isoformat())}
-                    }
-                
-                created_event = service.events().insert(
-                    calendarId='primary',
-                    body=event
-                ).execute()
-                
-                results.append(
-                    f"✅ Added: {created_event['summary']}\n"
-                    f"   ID: {created_event['id']}" +
-                    (" (All day)" if event_data.get("all_day", False) else "")
-                )
-            except Exception as e:
-                results.append(f"❌ Failed to add event '{event_data['title']}': {str(e)}")
-        
-        return [TextContent(
-            type="text",
-            text="\n\n".join(results)
-        )]
+            results[i] = f"❌ Failed to add event '{event_data['title']}': {str(e)}"
     
-    elif name == "search_events":
-        query = arguments["query"].lower()
-        max_results = arguments.get("max_results", 5)
-        days_ahead = arguments.get("days_ahead", 30)
-        
-        now = datetime.datetime.utcnow()
-        end = now + timedelta(days=days_ahead)
-        
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now.isoformat() + 'Z',
-            timeMax=end.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
-        if not events:
-            return [TextContent(type="text", text="No events found")]
-        
-        # Score and sort events by relevance
-        scored_events = []
-        for event in events:
-            title = event.get('summary', '').lower()
-            score = 0
-            
-            # Exact match gets highest score
-            if query == title:
-                score = 100
-            # Contains full query as substring
-            elif query in title:
-                score = 80
-            else:
-                # Score based on word matches
-                query_words = set(query.split())
-                title_words = set(title.split())
-                matching_words = query_words & title_words
-                if matching_words:
-                    score = (len(matching_words) / len(query_words)) * 60
-            
-            if score > 0:
-                scored_events.append((score, event))
-        
-        # Sort by score and take top results
-        scored_events.sort(reverse=True)
-        matches = scored_events[:max_results]
-        
-        if not matches:
-            return [TextContent(
-                type="text",
-                text=f"No events found matching '{arguments['query']}'"
-            )]
-        
-        formatted_events = []
-        for _, event in matches:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            formatted_events.append(
-                f"• {event['summary']}\n"
-                f"  When: {start} - {end}\n"
-                f"  ID: {event['id']}"
+    for i, (created_event, error) in zip(positions, await _execute_batch(service, requests)):
+        event_data = arguments["events"][i]
+        if error is None:
+            results[i] = (
+                f"✅ Added: {created_event['summary']}\n"
+                f"   ID: {created_event['id']}" +
+                (" (All day)" if event_data.get("all_day", False) else "")
             )
-        
+        else:
+            results[i] = f"❌ Failed to add event '{event_data['title']}': {str(error)}"
+    
+    return [TextContent(
+        type="text",
+        text="\n\n".join(results)
+    )]
+
+async def _search_events(service, arguments: Any) -> Sequence[TextContent]:
+    query = arguments["query"].casefold()
+    max_results = arguments.get("max_results", 5)
+    days_ahead = arguments.get("days_ahead", 30)
+    
+    now = datetime.datetime.now(UTC)
+    end = now + timedelta(days=days_ahead)
+    
+    events = await _list_all_events(
+        service,
+        timeMin=_rfc3339(now),
+        timeMax=_rfc3339(end)
+    )
+    if not events:
+        return [TextContent(type="text", text="No events found")]
+    
+    # Score and sort events by relevance
+    query_words = set(query.split())
+    # One pass over the title finds every query word, even next to punctuation
+    word_pattern = re.compile(
+        r'(?<!\w)(?:' +
+        '|'.join(re.escape(w) for w in sorted(query_words, key=len, reverse=True)) +
+        r')(?!\w)'
+    ) if query_words else None
+    scored_events = []
+    for i, event in enumerate(events):
+        title = event.get('summary', '').casefold()
+        score = 0
+    
+        # Exact match gets highest score
+        if query == title:
+            score = 100
+        # Contains full query as substring
+        elif query in title:
+            score = 80
+        elif word_pattern is not None:
+            # Score based on word matches
+            matching_words = set(word_pattern.findall(title))
+            if matching_words:
+                score = (len(matching_words) / len(query_words)) * 60
+    
+        if score > 0:
+            # Index breaks score ties so events (dicts) are never compared
+            scored_events.append((score, -i, event))
+    
+    # Take the top results by score, earliest event first on ties
+    matches = heapq.nlargest(max_results, scored_events, key=lambda item: item[:2])
+    
+    if not matches:
         return [TextContent(
             type="text",
-            text=f"Found {len(matches)} matching events:\n\n" + 
-                 "\n\n".join(formatted_events)
+            text=f"No events found matching '{arguments['query']}'"
         )]
     
-    raise ValueError(f"Unknown tool: {name}")
+    formatted_events = []
+    for _, _, event in matches:
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        formatted_events.append(
+            f"• {event['summary']}\n"
+            f"  When: {start} - {end}\n"
+            f"  ID: {event['id']}"
+        )
+    
+    return [TextContent(
+        type="text",
+        text=f"Found {len(matches)} matching events:\n\n" + 
+             "\n\n".join(formatted_events)
+    )]
+
+# Tool name -> handler, looked up by call_tool
+TOOL_HANDLERS = {
+    "quick_add": _quick_add,
+    "next": _next,
+    "cancel_next": _cancel_next,
+    "free_today": _free_today,
+    "list_events": _list_events,
+    "delete_event": _delete_event,
+    "delete_events": _delete_events,
+    "edit_event": _edit_event,
+    "bulk_add": _bulk_add,
+    "search_events": _search_events,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(await _calendar_service(), arguments)
 
 # Prompt handlers
+PROMPTS = [
+    Prompt(
+        name="suggest_meeting_time",
+        description="Get suggestions for meeting times",
+        arguments=[
+            PromptArgument(
+                name="duration",
+                description="Meeting duration in minutes",
+                required=True
+            ),
+            PromptArgument(
+                name="participants",
+                description="Number of participants",
+                required=True
+            )
+        ]
+    )
+]
+
 @server.list_prompts()
 async def list_prompts() -> list[Prompt]:
     """List available calendar prompts."""
-    return [
-        Prompt(
-            name="suggest_meeting_time",
-            description="Get suggestions for meeting times",
-            arguments=[
-                PromptArgument(
-                    name="duration",
-                    description="Meeting duration in minutes",
-                    required=True
-                ),
-                PromptArgument(
-                    name="participants",
-                    description="Number of participants",
-                    required=True
-                )
-            ]
-        )
-    ]
+    return PROMPTS
 
 @server.get_prompt()
 async def get_prompt(name: str, arguments: dict[str, str] | None) -> GetPromptResult:
@@ -732,14 +933,18 @@ async def get_prompt(name: str, arguments: dict[str, str] | None) -> GetPromptRe
 async def main():
     from mcp.server.stdio import stdio_server
     
-    logger.debug(f"Python executable: {sys.executable}")
-    logger.debug(f"Python version: {sys.version}")
+    logger.debug("Python executable: %s", sys.executable)
+    logger.debug("Python version: %s", sys.version)
     logger.debug("Starting calendar assistant server...")
     
     try:
         async with stdio_server() as (read_stream, write_stream):
             logger.debug("Server streams initialized")
-            logger.debug(f"Server capabilities: {server.get_capabilities(notification_options=NotificationOptions(), experimental_capabilities={})}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Server capabilities: %s", server.get_capabilities(
+                    notification_options=NotificationOptions(),
+                    experimental_capabilities={}
+                ))
             
             await server.run(
                 read_stream,
@@ -758,5 +963,10 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    import asyncio
+    # Use uvloop's faster event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,24 +1,25 @@
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import asyncio
+import os
+import sys
 import json
-from datetime import datetime, timedelta
 
-def format_time_until(end_time: datetime) -> str:
-    """Format time until reminder in a nice way"""
-    now = datetime.now()
-    diff = end_time - now
-    
-    if diff.total_seconds() < 0:
-        return "Due any moment!"
-    
-    minutes = int(diff.total_seconds() / 60)
+# Launch the server with the interpreter running this client
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'reminder_server', 'server.py')]
+)
+
+def format_time_left(seconds: float) -> str:
+    """Human-readable time until a reminder fires"""
+    minutes = seconds / 60
     if minutes < 1:
-        return "Less than a minute"
-    elif minutes == 1:
-        return "1 minute"
-    else:
-        return f"{minutes} minutes"
+        return "Due any moment!"
+    elif minutes < 2:
+        return "Due in 1 minute"
+    return f"Due in {int(minutes)} minutes"
 
 def format_result(result):
     """Format the result in a nice way"""
@@ -38,74 +39,76 @@ def format_result(result):
                     print("="*50)
                     print(text.replace('❌', '').strip())
                     print("="*50)
-                elif "Active reminders" in text:
+                elif text.startswith('['):
+                    # list_reminders returns a JSON array
+                    reminders = json.loads(text)
                     print("\n" + "="*50)
                     print("ACTIVE REMINDERS")
                     print("="*50)
-                    reminders = text.split('\n')[1:]  # Skip the header
+                    if not reminders:
+                        print(" No active reminders")
                     for reminder in reminders:
-                        # Already formatted nicely from the server
-                        print(f" {reminder.replace('•', '').strip()}")
+                        print(f" {reminder['id']} ({format_time_left(reminder['seconds_left'])})"
+                              f" - {reminder['message']}")
                     print("="*50)
                 else:
                     print(text)
     else:
         print(result)
 
-# Store active reminders and their end times
-active_reminders = {}
+async def ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
 
 async def handle_notifications(session):
     """Handle notifications from the server"""
     try:
-        while True:  # Keep running until cancelled
-            try:
-                # Get notification using the notification method
-                notification = await session.get_notification()
-                if notification:
-                    # Print notification in a nice format
-                    print("\n" + "="*50)
-                    print("🔔 REMINDER")
-                    print("="*50)
-                    if hasattr(notification, 'status'):
-                        print(notification.status)
-                    else:
-                        print(str(notification))
-                    print("="*50)
-                    
-                    # Reprint menu
-                    print("\nWhat would you like to do?")
-                    print("1. Set new reminder")
-                    print("2. List active reminders")
-                    print("3. Cancel a reminder")
-                    print("4. Exit")
-                    print("Choice > ", end='', flush=True)
-                
-                # Small delay to prevent CPU hogging
-                await asyncio.sleep(0.1)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"Notification error: {str(e)}")
-                await asyncio.sleep(1)  # Longer delay on error
-                
+        # Wakes only when the session's reader delivers a server message
+        async for notification in session.incoming_messages:
+            if isinstance(notification, Exception):
+                print(f"Notification error: {str(notification)}")
+                continue
+            
+            status = getattr(notification, 'status', None)
+            if status is None:
+                texts = [str(notification)]
+            else:
+                try:
+                    changes = json.loads(status)
+                except ValueError:
+                    texts = [status]
+                else:
+                    # The server batches changes and also reports added/cancelled
+                    # reminders, only show fired ones
+                    texts = [f"⏰ Reminder: {change['message']}"
+                             for change in changes if change.get("event") == "fired"]
+                    if not texts:
+                        continue
+            
+            # Print notification in a nice format
+            print("\n" + "="*50)
+            print("🔔 REMINDER")
+            print("="*50)
+            print("\n".join(texts))
+            print("="*50)
+            
+            # Reprint menu
+            print("\nWhat would you like to do?")
+            print("1. Set new reminder")
+            print("2. List active reminders")
+            print("3. Cancel a reminder")
+            print("4. Exit")
+            print("Choice > ", end='', flush=True)
+    
     except asyncio.CancelledError:
         pass  # Clean exit
 
 async def main():
-    global active_reminders
-    
     print("\n" + "="*50)
     print("REMINDER MANAGER")
     print("="*50)
-    
-    server_params = StdioServerParameters(
-        command="/Users/aviz/my-first-mcp/.venv/bin/python",
-        args=["/Users/aviz/my-first-mcp/src/reminder_server/server.py"]
-    )
 
-    async with stdio_client(server_params) as (read, write):
+    async with stdio_client(SERVER_PARAMS) as (read, write):
         async with ClientSession(read, write) as session:
             await session.initialize()
             
@@ -130,14 +133,14 @@ async def main():
                 print("4. Exit")
                 print("-"*30)
                 
-                choice = input("Choice > ")
+                choice = await ainput("Choice > ")
 
                 try:
                     if choice == "1":
                         print("\nSetting new reminder:")
                         print("-"*30)
-                        minutes = int(input("Minutes from now > "))
-                        message = input("Reminder message > ")
+                        minutes = int(await ainput("Minutes from now > "))
+                        message = await ainput("Reminder message > ")
                         
                         result = await session.call_tool(
                             "set_reminder",
@@ -146,14 +149,6 @@ async def main():
                                 "message": message
                             }
                         )
-                        # Store end time for new reminder
-                        if hasattr(result, 'content'):
-                            for item in result.content:
-                                if hasattr(item, 'text') and 'ID: ' in item.text:
-                                    rid = item.text.split('ID: ')[1].strip()
-                                    end_time = datetime.now() + timedelta(minutes=minutes)
-                                    active_reminders[rid] = end_time
-                        
                         format_result(result)
 
                     elif choice == "2":
@@ -166,7 +161,7 @@ async def main():
                     elif choice == "3":
                         print("\nCancelling reminder:")
                         print("-"*30)
-                        task_id = input("Reminder ID to cancel > ")
+                        task_id = await ainput("Reminder ID to cancel > ")
                         result = await session.call_tool(
                             "cancel_reminder",
                             arguments={"task_id": task_id}
@@ -7,7 +7,18 @@ from mcp.types import Tool, TextContent, Resource
 from typing import Any, Sequence
 import os
 import ast
-import json
+import functools
+
+try:
+    import orjson
+    
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+    
+    def dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
 
 # Configure logging
 logging.basicConfig(
@@ -21,78 +32,97 @@ logger = logging.getLogger(__name__)
 # Create server instance
 server = Server("code-analyzer")
 
+class StructureVisitor(ast.NodeVisitor):
+    """Collect module and class level definitions without entering function bodies"""
+    def __init__(self):
+        self.functions = []
+        self.classes = []
+        self.imports = []
+    
+    def visit_FunctionDef(self, node):
+        self.functions.append({
+            'name': node.name,
+            'args': [arg.arg for arg in node.args.args],
+            'line': node.lineno,
+            'doc': ast.get_docstring(node)
+        })
+        # Nested defs are implementation details, don't descend
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node):
+        self.classes.append({
+            'name': node.name,
+            'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
+            'methods': [m.name for m in node.body if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))],
+            'line': node.lineno,
+            'doc': ast.get_docstring(node)
+        })
+        self.generic_visit(node)
+    
+    def visit_Import(self, node):
+        self.imports.extend(name.name for name in node.names)
+    
+    def visit_ImportFrom(self, node):
+        # Keep every name of "from x import a, b"; relative imports may have no module
+        module = '.' * node.level + (node.module or '')
+        self.imports.extend(
+            f"{module}{name.name}" if module.endswith('.') else f"{module}.{name.name}"
+            for name in node.names
+        )
+
+@functools.lru_cache(maxsize=128)
+def _parse_file(path: str, mtime_ns: int, size: int) -> tuple[bytes, ast.AST, dict]:
+    """Read and analyze a file; mtime and size are part of the cache key"""
+    # The parser takes bytes (honouring any coding cookie), no need to decode first
+    with open(path, 'rb') as f:
+        data = f.read()
+    tree = ast.parse(data, filename=path)
+    visitor = StructureVisitor()
+    visitor.visit(tree)
+    return data, tree, {
+        'functions': visitor.functions,
+        'classes': visitor.classes,
+        'imports': visitor.imports,
+        'loc': len(data.splitlines()),
+    }
+
 class CodeAnalyzer:
     def __init__(self):
-        self.current_file = None
+        self.current_path = None
+        self.current_source = None
         self.current_ast = None
+        self.current_analysis = None
     
     def analyze_file(self, file_path: str) -> dict:
         """Analyze a Python file and return its structure"""
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                self.current_file = content
-                self.current_ast = ast.parse(content)
-                
-                return {
-                    'functions': self._get_functions(),
-                    'classes': self._get_classes(),
-                    'imports': self._get_imports(),
-                    'loc': len(content.splitlines()),
-                }
+            path = os.path.abspath(file_path)
+            stat = os.stat(path)
+            # Unchanged files are served from the cache without re-parsing
+            data, tree, analysis = _parse_file(path, stat.st_mtime_ns, stat.st_size)
+            self.current_path = path
+            self.current_source = data
+            self.current_ast = tree
+            self.current_analysis = analysis
+            return analysis
         except Exception as e:
             logger.error(f"Error analyzing file: {str(e)}")
             return None
     
-    def _get_functions(self) -> list[dict]:
-        """Extract function definitions"""
-        functions = []
-        for node in ast.walk(self.current_ast):
-            if isinstance(node, ast.FunctionDef):
-                functions.append({
-                    'name': node.name,
-                    'args': [arg.arg for arg in node.args.args],
-                    'line': node.lineno,
-                    'doc': ast.get_docstring(node)
-                })
-        return functions
-    
-    def _get_classes(self) -> list[dict]:
-        """Extract class definitions"""
-        classes = []
-        for node in ast.walk(self.current_ast):
-            if isinstance(node, ast.ClassDef):
-                classes.append({
-                    'name': node.name,
-                    'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
-                    'methods': [m.name for m in node.body if isinstance(m, ast.FunctionDef)],
-                    'line': node.lineno,
-                    'doc': ast.get_docstring(node)
-                })
-        return classes
-    
-    def _get_imports(self) -> list[str]:
-        """Extract imports"""
-        imports = []
-        for node in ast.walk(self.current_ast):
-            if isinstance(node, ast.Import):
-                imports.extend(name.name for name in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                imports.append(f"{node.module}.{node.names[0].name}")
-        return imports
-    
     def get_code_context(self) -> str:
         """Get current file content and analysis as context"""
-        if not self.current_file:
+        if not self.current_path:
             return "No file loaded"
         
-        analysis = self.analyze_file(self.current_file)
+        # Re-analyze by path: a cache hit unless the file changed since
+        analysis = self.analyze_file(self.current_path)
         if not analysis:
             return "Failed to analyze file"
         
         return f"""
 Current file content:
-{self.current_file}
+{self.current_source.decode('utf-8', errors='replace')}
 
 Analysis:
 - Functions: {len(analysis['functions'])}
@@ -101,66 +131,76 @@ Analysis:
 - Lines of code: {analysis['loc']}
 
 Detailed structure:
-{json.dumps(analysis, indent=2)}
+{dumps(analysis)}
 """
 
 # Global analyzer instance
 analyzer = CodeAnalyzer()
 
+# Tool listing is static, so it is built once at import
+TOOLS = [
+    Tool(
+        name="analyze_file",
+        description="Analyze a Python file and return its structure",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Path to Python file"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="get_context",
+        description="Get current file analysis context",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="analyze_file",
-            description="Analyze a Python file and return its structure",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to Python file"
-                    }
-                },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="get_context",
-            description="Get current file analysis context",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+    return TOOLS
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    global analyzer
-    
-    if name == "analyze_file":
-        path = arguments["path"]
-        result = analyzer.analyze_file(path)
-        
-        if result:
-            return [TextContent(
-                type="text",
-                text=f"Analysis of {path}:\n" + json.dumps(result, indent=2)
-            )]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Failed to analyze {path}"
-            )]
+async def _analyze_file(arguments: Any) -> Sequence[TextContent]:
+    path = arguments["path"]
+    result = analyzer.analyze_file(path)
     
-    elif name == "get_context":
-        context = analyzer.get_code_context()
+    if result:
         return [TextContent(
             type="text",
-            text=context
+            text=f"Analysis of {path}:\n" + dumps(result)
         )]
-    
-    raise ValueError(f"Unknown tool: {name}")
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Failed to analyze {path}"
+        )]
+
+async def _get_context(arguments: Any) -> Sequence[TextContent]:
+    context = analyzer.get_code_context()
+    return [TextContent(
+        type="text",
+        text=context
+    )]
+
+# Tool name -> handler, looked up by call_tool
+TOOL_HANDLERS = {
+    "analyze_file": _analyze_file,
+    "get_context": _get_context,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import os
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
@@ -20,170 +21,212 @@ logger = logging.getLogger(__name__)
 # Create server instance
 server = Server("file-watcher")
 
+# Seconds to collect events for a path before notifying
+DEBOUNCE_DELAY = 0.05
+
 class FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, server: Server):
-        self.server = server
+    """Forward watchdog events, which arrive on the observer thread, to the event loop"""
+    def __init__(self, loop: asyncio.AbstractEventLoop, changes: asyncio.Queue, watching: set):
+        self.loop = loop
+        self.changes = changes
+        # Only files directly inside a watched directory are reported
+        self.watching = watching
+        # path -> latest event type, waiting out the debounce window (loop thread only)
+        self.pending = {}
         super().__init__()
 
-    async def notify_change(self, event_type: str, path: str):
-        message = f"{event_type}: {path}"
-        await self.server.notify_status(message)
-        logger.debug(message)
+    def queue_change(self, event_type: str, path: str):
+        # asyncio.Queue is not thread-safe, hand the event over to the loop
+        self.loop.call_soon_threadsafe(self._debounce, event_type, path)
+
+    def _debounce(self, event_type: str, path: str):
+        # Editors save as delete+create+modify within milliseconds, report the burst once
+        if path not in self.pending:
+            self.loop.call_later(DEBOUNCE_DELAY, self._flush, path)
+        self.pending[path] = event_type
+
+    def _flush(self, path: str):
+        self.changes.put_nowait((self.pending.pop(path), path))
+
+    def is_watched(self, path: str) -> bool:
+        return os.path.dirname(path) in self.watching
 
     def on_created(self, event: FileSystemEvent):
-        if not event.is_directory:
-            asyncio.create_task(
-                self.notify_change(" File created", event.src_path)
-            )
+        if not event.is_directory and self.is_watched(event.src_path):
+            self.queue_change(" File created", event.src_path)
 
     def on_modified(self, event: FileSystemEvent):
-        if not event.is_directory:
-            asyncio.create_task(
-                self.notify_change("✏️ File modified", event.src_path)
-            )
+        if not event.is_directory and self.is_watched(event.src_path):
+            self.queue_change("✏️ File modified", event.src_path)
 
     def on_deleted(self, event: FileSystemEvent):
-        if not event.is_directory:
-            asyncio.create_task(
-                self.notify_change("🗑️ File deleted", event.src_path)
-            )
+        if not event.is_directory and self.is_watched(event.src_path):
+            self.queue_change("🗑️ File deleted", event.src_path)
 
     def on_moved(self, event: FileSystemEvent):
-        if not event.is_directory:
-            asyncio.create_task(
-                self.notify_change("📦 File moved/renamed", 
-                                 f"{event.src_path} -> {event.dest_path}")
-            )
+        if not event.is_directory and (self.is_watched(event.src_path)
+                                       or self.is_watched(event.dest_path)):
+            self.queue_change("📦 File moved/renamed", 
+                              f"{event.src_path} -> {event.dest_path}")
 
 class DirectoryWatcher:
     def __init__(self, server: Server):
         self.server = server
         self.observer = None
         self.watching = set()
+        # Watched path -> ObservedWatch, for O(1) unscheduling
+        self.watch_handles = {}
+        # Must be created on the event loop; changes are consumed by a single task
+        self.changes = asyncio.Queue()
+        self.handler = FileChangeHandler(asyncio.get_running_loop(), self.changes, self.watching)
+        self.notifier = asyncio.create_task(self.notify_changes())
+
+    async def notify_changes(self):
+        while True:
+            event_type, path = await self.changes.get()
+            message = f"{event_type}: {path}"
+            try:
+                await self.server.notify_status(message)
+            except Exception as e:
+                logger.error(f"Failed to send notification: {str(e)}")
+            logger.debug(message)
 
     def start_watching(self, path: str):
-        if path in self.watching:
+        # Key on the resolved path so "./x" and "x" can't create duplicate watches
+        abs_path = str(Path(path).expanduser().resolve())
+        if abs_path in self.watching:
             return False
         
         if self.observer is None:
             self.observer = Observer()
             self.observer.start()
         
-        abs_path = str(Path(path).expanduser().resolve())
-        event_handler = FileChangeHandler(self.server)
-        self.observer.schedule(event_handler, abs_path, recursive=False)
-        
-        self.watching.add(path)
+        # Scheduled before any state changes, so a failed watch leaves nothing behind
+        self.watch_handles[abs_path] = self.observer.schedule(
+            self.handler, abs_path, recursive=False
+        )
+        self.watching.add(abs_path)
         return True
 
     def stop_watching(self, path: str):
-        if path not in self.watching:
-            return False
-        
         abs_path = str(Path(path).expanduser().resolve())
-        if self.observer:
-            for watch in self.observer.watches.copy():
-                if watch.path == abs_path:
-                    self.observer.unschedule(watch)
+        if abs_path not in self.watching:
+            return False
         
-        self.watching.remove(path)
+        self.watching.remove(abs_path)
+        watch = self.watch_handles.pop(abs_path, None)
+        if self.observer and watch:
+            self.observer.unschedule(watch)
         return True
 
     def stop(self):
+        self.notifier.cancel()
         if self.observer:
             self.observer.stop()
             self.observer.join()
             self.observer = None
         self.watching.clear()
+        self.watch_handles.clear()
+
+# Tool listing is static, so it is built once at import
+TOOLS = [
+    Tool(
+        name="watch",
+        description="Start watching a directory",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Directory path to watch"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="unwatch",
+        description="Stop watching a directory",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Directory path to stop watching"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="list_watched",
+        description="List currently watched directories",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="watch",
-            description="Start watching a directory",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Directory path to watch"
-                    }
-                },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="unwatch",
-            description="Stop watching a directory",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Directory path to stop watching"
-                    }
-                },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="list_watched",
-            description="List currently watched directories",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+    return TOOLS
 
 # Global watcher instance
 watcher = None
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    global watcher
-    
-    if name == "watch":
-        path = arguments["path"]
-        if watcher.start_watching(path):
-            return [TextContent(
-                type="text",
-                text=f"✅ Started watching: {path}"
-            )]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"❌ Already watching: {path}"
-            )]
-    
-    elif name == "unwatch":
-        path = arguments["path"]
-        if watcher.stop_watching(path):
-            return [TextContent(
-                type="text",
-                text=f"✅ Stopped watching: {path}"
-            )]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"❌ Not watching: {path}"
-            )]
-    
-    elif name == "list_watched":
-        if not watcher.watching:
-            return [TextContent(
-                type="text",
-                text="No directories being watched"
-            )]
-        
-        paths = "\n".join(f"• {path}" for path in watcher.watching)
+async def _watch(arguments: Any) -> Sequence[TextContent]:
+    path = arguments["path"]
+    if watcher.start_watching(path):
+        return [TextContent(
+            type="text",
+            text=f"✅ Started watching: {path}"
+        )]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"❌ Already watching: {path}"
+        )]
+
+async def _unwatch(arguments: Any) -> Sequence[TextContent]:
+    path = arguments["path"]
+    if watcher.stop_watching(path):
         return [TextContent(
             type="text",
-            text=f"Watching directories:\n{paths}"
+            text=f"✅ Stopped watching: {path}"
+        )]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"❌ Not watching: {path}"
+        )]
+
+async def _list_watched(arguments: Any) -> Sequence[TextContent]:
+    if not watcher.watching:
+        return [TextContent(
+            type="text",
+            text="No directories being watched"
         )]
     
-    raise ValueError(f"Unknown tool: {name}")
+    paths = "\n".join(f"• {path}" for path in watcher.watching)
+    return [TextContent(
+        type="text",
+        text=f"Watching directories:\n{paths}"
+    )]
+
+# Tool name -> handler, looked up by call_tool
+TOOL_HANDLERS = {
+    "watch": _watch,
+    "unwatch": _unwatch,
+    "list_watched": _list_watched,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 async def main():
     global watcher
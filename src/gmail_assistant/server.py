@@ -6,243 +6,297 @@ from mcp.types import Tool, TextContent
 from typing import Any, Sequence
 import os.path
 import json
+import base64
+from email.mime.text import MIMEText
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+import httplib2
+import threading
 
 logger = logging.getLogger(__name__)
 server = Server("gmail-assistant")
 
 # Gmail API setup
 SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
+CREDENTIALS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'credentials.json')
+TOKEN_PATH = os.path.join(os.path.dirname(CREDENTIALS_PATH), 'token.json')
+
+# Cached service so tool calls don't re-read the token and rebuild the client
+_SERVICE_CACHE = {"svc": None, "creds": None}
+_SERVICE_LOCK = threading.Lock()
 
 def get_gmail_service():
     """Get authenticated Gmail service"""
-    creds = None
-    creds_path = os.path.join(os.path.dirname(__file__), '..', '..', 'credentials.json')
-    token_path = os.path.join(os.path.dirname(creds_path), 'token.json')
-    
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    with _SERVICE_LOCK:
+        svc = _SERVICE_CACHE["svc"]
+        creds = _SERVICE_CACHE["creds"]
+        if svc is not None and creds.valid:
+            return svc
+        if svc is not None and creds.expired and creds.refresh_token:
+            # Refresh in place; the cached service keeps using these creds
             creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(creds_path, SCOPES)
-            creds = flow.run_local_server(port=0)
+            with open(TOKEN_PATH, 'w') as token:
+                token.write(creds.to_json())
+            return svc
+        
+        creds = None
+        if os.path.exists(TOKEN_PATH):
+            creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
         
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+                creds = flow.run_local_server(port=0)
+            
+            with open(TOKEN_PATH, 'w') as token:
+                token.write(creds.to_json())
+        
+        svc = build('gmail', 'v1', credentials=creds)
+        _SERVICE_CACHE["svc"] = svc
+        _SERVICE_CACHE["creds"] = creds
+        return svc
+
+_thread_local = threading.local()
+
+def _thread_http():
+    """Authorized Http for the calling thread - httplib2.Http is not thread-safe"""
+    creds = _SERVICE_CACHE["creds"]
+    if getattr(_thread_local, 'creds', None) is not creds:
+        _thread_local.creds = creds
+        _thread_local.http = AuthorizedHttp(creds, http=httplib2.Http())
+    return _thread_local.http
+
+async def execute(request):
+    """Execute an API request on a worker thread so the event loop stays free"""
+    return await asyncio.to_thread(lambda: request.execute(http=_thread_http()))
+
+# Gmail recommends at most 50 calls per batch request
+BATCH_LIMIT = 50
+
+def format_summary(message: dict) -> str:
+    """Format a metadata-only message as a list entry"""
+    headers = {h['name']: h['value'] for h in message['payload']['headers']}
+    return (
+        f"• From: {headers.get('From', 'Unknown')}\n"
+        f"  Subject: {headers.get('Subject', '(no subject)')}\n"
+        f"  Date: {headers.get('Date', 'Unknown')}\n"
+        f"  ID: {message['id']}"
+    )
+
+async def get_message_summaries(service, message_refs: list[dict]) -> list[str]:
+    """Fetch From/Subject/Date for messages with batch requests, in list order"""
+    summaries = [None] * len(message_refs)
+    
+    def callback(request_id, response, exception):
+        i = int(request_id)
+        if exception is None:
+            summaries[i] = format_summary(response)
+        else:
+            summaries[i] = f"• ID: {message_refs[i]['id']}\n  ❌ Failed to fetch: {str(exception)}"
     
-    return build('gmail', 'v1', credentials=creds)
+    messages = service.users().messages()
+    for offset in range(0, len(message_refs), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=callback)
+        for i in range(offset, min(offset + BATCH_LIMIT, len(message_refs))):
+            batch.add(messages.get(
+                userId='me',
+                id=message_refs[i]['id'],
+                format='metadata',
+                metadataHeaders=['From', 'Subject', 'Date']
+            ), request_id=str(i))
+        await execute(batch)
+    return summaries
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="list_messages",
-            description="List recent email messages",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to return",
-                        "default": 10
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (Gmail search syntax)",
-                        "default": ""
-                    }
+# Tool listing is static, so it is built once at import
+TOOLS = [
+    Tool(
+        name="list_messages",
+        description="List recent email messages",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to return",
+                    "default": 10
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Search query (Gmail search syntax)",
+                    "default": ""
                 }
             }
-        ),
-        Tool(
-            name="send_email",
-            description="Send a new email",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "to": {
-                        "type": "string",
-                        "description": "Recipient email address"
-                    },
-                    "subject": {
-                        "type": "string",
-                        "description": "Email subject"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Email body (plain text)"
-                    }
+        }
+    ),
+    Tool(
+        name="send_email",
+        description="Send a new email",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "to": {
+                    "type": "string",
+                    "description": "Recipient email address"
                 },
-                "required": ["to", "subject", "body"]
-            }
-        ),
-        Tool(
-            name="get_message",
-            description="Get a specific email message",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message_id": {
-                        "type": "string",
-                        "description": "Message ID"
-                    }
+                "subject": {
+                    "type": "string",
+                    "description": "Email subject"
                 },
-                "required": ["message_id"]
-            }
-        ),
-        Tool(
-            name="search_emails",
-            description="Search for emails",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Gmail search query"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 10
-                    }
+                "body": {
+                    "type": "string",
+                    "description": "Email body (plain text)"
+                }
+            },
+            "required": ["to", "subject", "body"]
+        }
+    ),
+    Tool(
+        name="get_message",
+        description="Get a specific email message",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message_id": {
+                    "type": "string",
+                    "description": "Message ID"
+                }
+            },
+            "required": ["message_id"]
+        }
+    ),
+    Tool(
+        name="search_emails",
+        description="Search for emails",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Gmail search query"
                 },
-                "required": ["query"]
-            }
-        )
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 10
+                }
+            },
+            "required": ["query"]
+        }
+    )
+]
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    return TOOLS
+
+async def _list_messages(service, arguments: Any) -> Sequence[TextContent]:
+    max_results = arguments.get("max_results", 10)
+    query = arguments.get("query", "")
+    
+    results = await execute(service.users().messages().list(
+        userId='me',
+        maxResults=max_results,
+        q=query
+    ))
+    
+    messages = await get_message_summaries(service, results.get('messages', []))
+    
+    # One content item per message, no need to join them into one string
+    return [TextContent(type="text", text="Recent messages:")] + [
+        TextContent(type="text", text=message) for message in messages
     ]
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    service = get_gmail_service()
+async def _send_email(service, arguments: Any) -> Sequence[TextContent]:
+    message = MIMEText(arguments["body"])
+    message['to'] = arguments["to"]
+    message['subject'] = arguments["subject"]
     
-    if name == "list_messages":
-        max_results = arguments.get("max_results", 10)
-        query = arguments.get("query", "")
-        
-        results = service.users().messages().list(
+    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    
+    try:
+        await execute(service.users().messages().send(
             userId='me',
-            maxResults=max_results,
-            q=query
-        ).execute()
-        
-        messages = []
-        for msg in results.get('messages', []):
-            message = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date']
-            ).execute()
-            
-            headers = {h['name']: h['value'] for h in message['payload']['headers']}
-            messages.append(
-                f"• From: {headers.get('From', 'Unknown')}\n"
-                f"  Subject: {headers.get('Subject', '(no subject)')}\n"
-                f"  Date: {headers.get('Date', 'Unknown')}\n"
-                f"  ID: {message['id']}"
-            )
+            body={'raw': raw}
+        ))
         
         return [TextContent(
             type="text",
-            text="Recent messages:\n\n" + "\n\n".join(messages)
+            text=f"✅ Email sent to {arguments['to']}"
         )]
-    
-    elif name == "send_email":
-        from email.mime.text import MIMEText
-        import base64
-        
-        message = MIMEText(arguments["body"])
-        message['to'] = arguments["to"]
-        message['subject'] = arguments["subject"]
-        
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        try:
-            service.users().messages().send(
-                userId='me',
-                body={'raw': raw}
-            ).execute()
-            
-            return [TextContent(
-                type="text",
-                text=f"✅ Email sent to {arguments['to']}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"❌ Failed to send email: {str(e)}"
-            )]
-    
-    elif name == "get_message":
-        message = service.users().messages().get(
-            userId='me',
-            id=arguments["message_id"]
-        ).execute()
-        
-        headers = {h['name']: h['value'] for h in message['payload']['headers']}
-        
-        # Get message body
-        body = ""
-        if 'parts' in message['payload']:
-            for part in message['payload']['parts']:
-                if part['mimeType'] == 'text/plain':
-                    body = base64.urlsafe_b64decode(
-                        part['body']['data']
-                    ).decode()
-                    break
-        elif 'body' in message['payload']:
-            body = base64.urlsafe_b64decode(
-                message['payload']['body']['data']
-            ).decode()
-        
+    except Exception as e:
         return [TextContent(
             type="text",
-            text=f"""Email details:
+            text=f"❌ Failed to send email: {str(e)}"
+        )]
+
+async def _get_message(service, arguments: Any) -> Sequence[TextContent]:
+    message = await execute(service.users().messages().get(
+        userId='me',
+        id=arguments["message_id"]
+    ))
+    
+    headers = {h['name']: h['value'] for h in message['payload']['headers']}
+    
+    # Get message body
+    body = ""
+    if 'parts' in message['payload']:
+        for part in message['payload']['parts']:
+            if part['mimeType'] == 'text/plain':
+                body = base64.urlsafe_b64decode(
+                    part['body']['data']
+                ).decode()
+                break
+    elif 'body' in message['payload']:
+        body = base64.urlsafe_b64decode(
+            message['payload']['body']['data']
+        ).decode()
+    
+    return [TextContent(
+        type="text",
+        text=f"""Email details:
 From: {headers.get('From', 'Unknown')}
 To: {headers.get('To', 'Unknown')}
 Subject: {headers.get('Subject', '(no subject)')}
 Date: {headers.get('Date', 'Unknown')}
 
 {body}"""
-        )]
+    )]
+
+async def _search_emails(service, arguments: Any) -> Sequence[TextContent]:
+    results = await execute(service.users().messages().list(
+        userId='me',
+        maxResults=arguments.get("max_results", 10),
+        q=arguments["query"]
+    ))
     
-    elif name == "search_emails":
-        results = service.users().messages().list(
-            userId='me',
-            maxResults=arguments.get("max_results", 10),
-            q=arguments["query"]
-        ).execute()
-        
-        messages = []
-        for msg in results.get('messages', []):
-            message = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date']
-            ).execute()
-            
-            headers = {h['name']: h['value'] for h in message['payload']['headers']}
-            messages.append(
-                f"• From: {headers.get('From', 'Unknown')}\n"
-                f"  Subject: {headers.get('Subject', '(no subject)')}\n"
-                f"  Date: {headers.get('Date', 'Unknown')}\n"
-                f"  ID: {message['id']}"
-            )
-        
-        return [TextContent(
-            type="text",
-            text=f"Search results for '{arguments['query']}':\n\n" + 
-                 "\n\n".join(messages)
-        )]
+    messages = await get_message_summaries(service, results.get('messages', []))
     
-    raise ValueError(f"Unknown tool: {name}")
+    return [TextContent(type="text", text=f"Search results for '{arguments['query']}':")] + [
+        TextContent(type="text", text=message) for message in messages
+    ]
+
+# Tool name -> handler, looked up by call_tool
+TOOL_HANDLERS = {
+    "list_messages": _list_messages,
+    "send_email": _send_email,
+    "get_message": _get_message,
+    "search_emails": _search_emails,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    service = _SERVICE_CACHE["svc"]
+    if service is None or not _SERVICE_CACHE["creds"].valid:
+        service = await asyncio.to_thread(get_gmail_service)
+    return await handler(service, arguments)
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -2,13 +2,41 @@ import os
 os.environ['TK_SILENCE_DEPRECATION'] = '1'
 
 import asyncio
+import sys
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 from datetime import datetime
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import json
-from concurrent.futures import ThreadPoolExecutor
+import time
+import threading
+import collections
+
+# Launch the server with the interpreter running this client
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'reminder_server', 'server.py')]
+)
+
+def format_time_left(seconds: float) -> str:
+    """Human-readable time until a reminder fires"""
+    minutes = seconds / 60
+    if minutes < 1:
+        return "Due any moment!"
+    elif minutes < 2:
+        return "Due in 1 minute"
+    return f"Due in {int(minutes)} minutes"
+
+# Seconds to keep collecting notifications after the first one of a burst
+NOTIFICATION_BATCH_WINDOW = 0.05
+
+# Milliseconds between Tk drains of the cross-thread queues
+DRAIN_INTERVAL = 50
+
+# Log lines kept waiting for the next drain; older ones are dropped first
+LOG_QUEUE_LIMIT = 1000
 
 class ReminderApp:
     def __init__(self, root):
@@ -19,16 +47,27 @@ class ReminderApp:
         # Setup UI
         self._setup_ui()
         
+        # Filled from any thread, emptied on the Tk thread by _drain()
+        self._queue_lock = threading.Lock()
+        self._log_queue = collections.deque(maxlen=LOG_QUEUE_LIMIT)
+        # Not bounded: dropping a notification would desync the reminder list
+        self._notification_queue = collections.deque()
+        # Latest list_reminders result not yet shown, applied before queued notifications
+        self._snapshot = None
+        
         # Initialize async stuff
         self.session = None
         self.loop = asyncio.new_event_loop()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)
         
-        # Start MCP client
-        self.thread_pool.submit(self._start_mcp_client)
+        # Start MCP client on its own loop thread
+        threading.Thread(target=self._start_mcp_client, daemon=True).start()
         
-        # Schedule periodic updates
-        self.root.after(1000, self._periodic_update)
+        # task_id -> (end epoch, message), kept current by server notifications
+        self._cached = {}
+        
+        # Refresh the "Time Left" column locally, no server round-trip
+        self.root.after(1000, self._tick)
+        self.root.after(DRAIN_INTERVAL, self._drain)
     
     def _setup_ui(self):
         # Main frame
@@ -81,34 +120,85 @@ class ReminderApp:
         self.loop.run_until_complete(self._init_mcp())
     
     async def _init_mcp(self):
-        server_params = StdioServerParameters(
-            command="/Users/aviz/my-first-mcp/.venv/bin/python",
-            args=["/Users/aviz/my-first-mcp/src/reminder_server/server.py"]
-        )
-        
         try:
             self._log("Connecting to reminder server...")
-            async with stdio_client(server_params) as (read, write):
+            async with stdio_client(SERVER_PARAMS) as (read, write):
                 async with ClientSession(read, write) as session:
                     self.session = session
                     await session.initialize()
                     self._log("✅ Connected to reminder server")
                     
-                    while True:
-                        try:
-                            notification = await session.get_notification()
-                            if notification:
-                                self.root.after(0, self._log, f"🔔 {notification.status}")
-                        except Exception as e:
-                            self._log(f"Notification error: {str(e)}")
-                        await asyncio.sleep(0.1)
+                    # Fill the list once; notifications keep it current from here on
+                    await self._async_refresh_reminders()
+                    
+                    # The reader only forwards; batching waits on a queue, so a
+                    # timed-out wait never cancels a read from the session stream
+                    incoming = asyncio.Queue()
+                    reader = asyncio.create_task(self._read_messages(session, incoming))
+                    try:
+                        while True:
+                            # Wait for one message, then collect the rest of the burst
+                            messages = [await incoming.get()]
+                            while True:
+                                try:
+                                    messages.append(await asyncio.wait_for(
+                                        incoming.get(), NOTIFICATION_BATCH_WINDOW
+                                    ))
+                                except asyncio.TimeoutError:
+                                    break
+                            
+                            statuses = []
+                            for message in messages:
+                                if message is None:
+                                    raise ConnectionError("Server closed the connection")
+                                if isinstance(message, Exception):
+                                    self._log(f"Notification error: {str(message)}")
+                                    continue
+                                status = getattr(message, 'status', None)
+                                if status is not None:
+                                    statuses.append(status)
+                            if statuses:
+                                with self._queue_lock:
+                                    self._notification_queue.extend(statuses)
+                    finally:
+                        reader.cancel()
         except Exception as e:
             self._log(f"Connection error: {str(e)}")
     
+    async def _read_messages(self, session, incoming: asyncio.Queue):
+        # Wakes only when the session's reader delivers a server message
+        async for message in session.incoming_messages:
+            incoming.put_nowait(message)
+        # End of stream
+        incoming.put_nowait(None)
+    
     def _log(self, message):
+        """Queue a log line; safe to call from any thread"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
+        with self._queue_lock:
+            self._log_queue.append(f"[{timestamp}] {message}\n")
+    
+    def _drain(self):
+        with self._queue_lock:
+            snapshot, self._snapshot = self._snapshot, None
+            statuses = list(self._notification_queue)
+            self._notification_queue.clear()
+        
+        if snapshot is not None:
+            self._apply_snapshot(snapshot)
+        for status in statuses:
+            for message in self._apply_notification(status):
+                self._log(message)
+        
+        with self._queue_lock:
+            lines = "".join(self._log_queue)
+            self._log_queue.clear()
+        if lines:
+            # One insert and one scroll for everything queued since the last drain
+            self.log_text.insert(tk.END, lines)
+            self.log_text.see(tk.END)
+        
+        self.root.after(DRAIN_INTERVAL, self._drain)
     
     def _add_reminder(self):
         minutes = self.minutes_var.get()
@@ -144,48 +234,76 @@ class ReminderApp:
                 }
             )
             self.root.after(0, self._handle_add_result, result, minutes, message)
+            await self._async_refresh_reminders()
+        except Exception as e:
+            self._log(f"❌ Error: {str(e)}")
+    
+    async def _async_refresh_reminders(self):
+        try:
+            result = await self.session.call_tool("list_reminders", arguments={})
+            for item in result.content:
+                if hasattr(item, 'text'):
+                    reminders = json.loads(item.text)
+                    with self._queue_lock:
+                        self._snapshot = reminders
+                    return
         except Exception as e:
-            self.root.after(0, self._log, f"❌ Error: {str(e)}")
+            self._log(f"❌ Error listing reminders: {str(e)}")
     
     def _handle_add_result(self, result, minutes, message):
+        # The list itself is updated by the "added" notification and the refresh after it
         self._log(f"✅ Reminder set for {minutes} minutes: {message}")
         self.minutes_var.set("")
         self.message_var.set("")
-        self._update_reminders()
     
-    def _update_reminders(self):
-        if self.session:
-            asyncio.run_coroutine_threadsafe(self._async_update_reminders(), self.loop)
-    
-    async def _async_update_reminders(self):
+    def _apply_notification(self, status):
+        """Update the reminder list from one notification; returns the lines to log"""
         try:
-            result = await self.session.call_tool(
-                "list_reminders",
-                arguments={}
-            )
-            self.root.after(0, self._update_reminders_list, result)
-        except Exception as e:
-            self.root.after(0, self._log, f"❌ Error updating reminders: {str(e)}")
+            changes = json.loads(status)
+        except (TypeError, ValueError):
+            return [f"🔔 {status}"]
+        
+        # The server batches changes that happen close together
+        messages = (self._apply_change(change) for change in changes)
+        return [message for message in messages if message]
     
-    def _update_reminders_list(self, result):
-        for item in self.reminders_list.get_children():
-            self.reminders_list.delete(item)
+    def _apply_change(self, change):
+        """Update the reminder list from one change; returns the line to log, if any"""
+        tid = change["id"]
+        if change["event"] == "added":
+            self._show_reminder(tid, change["end_time"], change["message"])
+            return None
         
-        if hasattr(result, 'content'):
-            for item in result.content:
-                if hasattr(item, 'text'):
-                    lines = item.text.split('\n')[1:]  # Skip header
-                    for line in lines:
-                        if line.strip():
-                            parts = line.replace('•', '').strip().split(' (', 1)
-                            if len(parts) == 2:
-                                rid = parts[0]
-                                time_str = parts[1].rstrip(')')
-                                self.reminders_list.insert('', tk.END, values=(rid, time_str, ""))
+        if self._cached.pop(tid, None) is not None:
+            self.reminders_list.delete(tid)
+        if change["event"] == "fired":
+            return f"🔔 ⏰ Reminder: {change['message']}"
+        return f"🗑️ Reminder cancelled: {change['message']}"
+    
+    def _show_reminder(self, tid, end_time, message):
+        # Idempotent, a reminder can arrive both in a snapshot and as "added"
+        end_epoch = datetime.fromisoformat(end_time).timestamp()
+        values = (tid, format_time_left(end_epoch - time.time()), message)
+        if tid in self._cached:
+            self.reminders_list.item(tid, values=values)
+        else:
+            self.reminders_list.insert('', tk.END, iid=tid, values=values)
+        self._cached[tid] = (end_epoch, message)
+    
+    def _apply_snapshot(self, reminders):
+        """Replace the reminder list with a list_reminders result"""
+        current = {reminder["id"] for reminder in reminders}
+        for tid in [tid for tid in self._cached if tid not in current]:
+            del self._cached[tid]
+            self.reminders_list.delete(tid)
+        for reminder in reminders:
+            self._show_reminder(reminder["id"], reminder["end_time"], reminder["message"])
     
-    def _periodic_update(self):
-        self._update_reminders()
-        self.root.after(1000, self._periodic_update)  # Update every second
+    def _tick(self):
+        now = time.time()
+        for tid, (end_epoch, _) in self._cached.items():
+            self.reminders_list.set(tid, "time", format_time_left(end_epoch - now))
+        self.root.after(1000, self._tick)
 
 def main():
     root = tk.Tk()
@@ -1,55 +1,108 @@
 import streamlit as st
 import asyncio
+import os
+import sys
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from concurrent.futures import ThreadPoolExecutor
-import os
+import threading
+import base64
 from PIL import Image
 import io
 import time
+import atexit
+
+# Launch the server with the interpreter running this client
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'image_analyzer', 'server.py')]
+)
+
+# Reconnect backoff bounds, in seconds
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Stop retrying after this many consecutive failures within the window (seconds)
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_WINDOW = 30
+
+# Seconds allowed for the MCP handshake before the attempt counts as failed
+INIT_TIMEOUT = 5
+
+# Seconds close() waits for the client loop to shut the session down
+CLOSE_TIMEOUT = 5
 
 class ImageAnalyzer:
     def __init__(self):
         self.session = None
         self.loop = asyncio.new_event_loop()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)
         self.initialized = False
+        # Set when reconnecting has been given up on
+        self.error = None
+        # Set (on the client loop) to close the session
+        self._closed = None
+        self._closing = False
         self._start_client()
+        atexit.register(self.close)
     
     def _start_client(self):
-        self.thread_pool.submit(self._run_async_client)
+        self._thread = threading.Thread(target=self._run_async_client, daemon=True)
+        self._thread.start()
     
     def _run_async_client(self):
         asyncio.set_event_loop(self.loop)
         self.loop.run_until_complete(self._init_mcp())
     
+    def close(self):
+        """Close the MCP session and stop reconnecting"""
+        self._closing = True
+        if self._closed is not None:
+            self.loop.call_soon_threadsafe(self._closed.set)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(CLOSE_TIMEOUT)
+    
     async def _init_mcp(self):
-        server_params = StdioServerParameters(
-            command="/Users/aviz/my-first-mcp/.venv/bin/python",
-            args=["/Users/aviz/my-first-mcp/src/image_analyzer/server.py"]
-        )
-        
-        try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.session = session
-                    await session.initialize()
-                    self.initialized = True
-                    while True:
-                        await asyncio.sleep(0.1)
-        except Exception as e:
-            print(f"Connection error: {str(e)}")
+        self._closed = asyncio.Event()
+        delay = RECONNECT_MIN_DELAY
+        failures = []
+        last_error = None
+        while not self._closing:
+            try:
+                async with stdio_client(SERVER_PARAMS) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        self.session = session
+                        # A server that hangs on startup is retried like one that crashed
+                        await asyncio.wait_for(session.initialize(), INIT_TIMEOUT)
+                        self.initialized = True
+                        delay = RECONNECT_MIN_DELAY
+                        failures.clear()
+                        
+                        # Park until close(); a dropped connection raises out of here
+                        await self._closed.wait()
+            except Exception as e:
+                print(f"Connection error: {str(e)}")
+                last_error = str(e)
+            self.session = None
             self.initialized = False
-            await asyncio.sleep(5)
-            await self._init_mcp()
+            if self._closing:
+                break
+            
+            now = time.monotonic()
+            failures = [t for t in failures if now - t < CIRCUIT_BREAKER_WINDOW] + [now]
+            if len(failures) >= CIRCUIT_BREAKER_FAILURES:
+                # The server keeps failing, stop spawning it and report instead
+                self.error = f"Could not connect to the image analyzer: {last_error}"
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
     
-    def analyze_image(self, image_path: str):
+    def analyze_image(self, image_bytes: bytes, name: str):
         if not self.session or not self.initialized:
             return "System not ready", False
         
         try:
             future = asyncio.run_coroutine_threadsafe(
-                self._analyze_image(image_path),
+                self._analyze_image(image_bytes, name),
                 self.loop
             )
             result = future.result(timeout=30)  # Longer timeout for image analysis
@@ -57,11 +110,14 @@ class ImageAnalyzer:
         except Exception as e:
             return f"Error: {str(e)}", False
     
-    async def _analyze_image(self, image_path: str):
-        # First load the image
+    async def _analyze_image(self, image_bytes: bytes, name: str):
+        # First load the image, sent inline so nothing touches the disk
         await self.session.call_tool(
             "analyze_image",
-            arguments={"path": image_path}
+            arguments={
+                "data": base64.b64encode(image_bytes).decode('ascii'),
+                "name": name
+            }
         )
         
         # Then get the analysis
@@ -82,10 +138,19 @@ if 'analyzer' not in st.session_state:
 st.set_page_config(page_title="Image Analyzer", page_icon="🖼️", layout="wide")
 st.title("🖼️ AI Image Analyzer")
 
-# Connection status
-if not st.session_state.analyzer.initialized:
+# Connection status; only this fragment polls, so an uploaded image isn't re-analyzed
+@st.fragment(run_every=1)
+def connection_status():
+    if st.session_state.analyzer.initialized or st.session_state.analyzer.error:
+        # Rerun the whole page once the connection settles either way
+        st.rerun()
     st.warning("⏳ Connecting to system...")
 
+if st.session_state.analyzer.error:
+    st.error(st.session_state.analyzer.error)
+elif not st.session_state.analyzer.initialized:
+    connection_status()
+
 # File uploader
 uploaded_file = st.file_uploader("Choose an image...", type=['png', 'jpg', 'jpeg'])
 
@@ -100,24 +165,13 @@ if uploaded_file is not None:
     with col2:
         st.subheader("Analysis")
         
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getvalue())
-        
         # Analyze image
         with st.spinner("Analyzing image..."):
-            analysis, success = st.session_state.analyzer.analyze_image(temp_path)
+            analysis, success = st.session_state.analyzer.analyze_image(
+                uploaded_file.getvalue(), uploaded_file.name
+            )
             
             if success:
                 st.markdown(analysis)
             else:
                 st.error(analysis)
-        
-        # Clean up
-        os.remove(temp_path)
-
-# Auto-refresh for connection status
-if not st.session_state.analyzer.initialized:
-    time.sleep(1)
-    st.rerun() 
\ No newline at end of file
@@ -2,7 +2,7 @@ import asyncio
 import logging
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
-from mcp.types import Tool, TextContent
+from mcp.types import Tool, TextContent, ImageContent, SamplingMessage
 from typing import Any, Sequence
 import base64
 from PIL import Image
@@ -15,36 +15,68 @@ server = Server("image-analyzer")
 
 class ImageAnalyzer:
     def __init__(self):
-        self.current_image = None
         self.current_image_path = None
+        # The file as stored on disk; PIL only reads its header for metadata
+        self._raw_bytes = None
+        # Only the current image is ever read, so only its results are kept
+        self._b64 = None
+        self._info = None
     
     def load_image(self, path: str) -> bool:
         try:
-            self.current_image = Image.open(path)
-            self.current_image_path = path
+            with open(path, 'rb') as f:
+                raw_bytes = f.read()
+        except Exception as e:
+            logger.error(f"Error loading image: {e}")
+            return False
+        return self.load_bytes(raw_bytes, path)
+    
+    def load_base64(self, data: str, name: str) -> bool:
+        """Load an image sent as base64; the string itself becomes the current encoding"""
+        try:
+            raw_bytes = base64.b64decode(data, validate=True)
+        except ValueError as e:
+            logger.error(f"Error loading image: {e}")
+            return False
+        if not self.load_bytes(raw_bytes, name):
+            return False
+        # Set only once this upload is the current image, never kept for a name
+        self._b64 = data
+        return True
+    
+    def load_bytes(self, raw_bytes: bytes, name: str) -> bool:
+        """Load an image from memory"""
+        try:
+            # Only the header is parsed, pixels are never decoded
+            with Image.open(io.BytesIO(raw_bytes)) as image:
+                info = {
+                    'format': image.format,
+                    'size': image.size,
+                    'mode': image.mode,
+                    'path': name
+                }
+            self.current_image_path = name
+            self._raw_bytes = raw_bytes
+            self._info = info
+            self._b64 = None
             return True
         except Exception as e:
             logger.error(f"Error loading image: {e}")
             return False
     
     def get_image_info(self) -> dict:
-        if not self.current_image:
+        if self._raw_bytes is None:
             return None
-        
-        return {
-            'format': self.current_image.format,
-            'size': self.current_image.size,
-            'mode': self.current_image.mode,
-            'path': self.current_image_path
-        }
+        return self._info
     
     def get_image_base64(self) -> str:
-        if not self.current_image:
+        if self._raw_bytes is None:
             return None
         
-        buffered = io.BytesIO()
-        self.current_image.save(buffered, format=self.current_image.format)
-        return base64.b64encode(buffered.getvalue()).decode()
+        if self._b64 is None:
+            # Send the original file instead of a lossy decode/re-encode round trip
+            self._b64 = base64.b64encode(self._raw_bytes).decode('ascii')
+        return self._b64
 
 analyzer = ImageAnalyzer()
 
@@ -53,16 +85,25 @@ async def list_tools() -> list[Tool]:
     return [
         Tool(
             name="analyze_image",
-            description="Load and analyze an image file",
+            description="Load and analyze an image, from a file path or base64 data",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "path": {
                         "type": "string",
                         "description": "Path to image file"
+                    },
+                    "data": {
+                        "type": "string",
+                        "description": "Base64-encoded image file, instead of path"
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Name reported for an image passed as data",
+                        "default": "upload"
                     }
                 },
-                "required": ["path"]
+                "anyOf": [{"required": ["path"]}, {"required": ["data"]}]
             }
         ),
         Tool(
@@ -80,8 +121,20 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     global analyzer
     
     if name == "analyze_image":
-        path = arguments["path"]
-        if analyzer.load_image(path):
+        if "data" not in arguments and "path" not in arguments:
+            return [TextContent(
+                type="text",
+                text="Provide either path or data"
+            )]
+        if "data" in arguments:
+            # Uploaded bytes, no temporary file needed
+            path = arguments.get("name", "upload")
+            loaded = analyzer.load_base64(arguments["data"], path)
+        else:
+            path = arguments["path"]
+            loaded = analyzer.load_image(path)
+        
+        if loaded:
             info = analyzer.get_image_info()
             return [TextContent(
                 type="text",
@@ -98,23 +151,24 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
         if info:
             context = server.request_context
             
-            # Create messages array
+            # Built as models so the cached base64 string is passed through as is,
+            # not copied into a dict and validated again; sampling only takes base64
             messages = [
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "image",
-                        "data": analyzer.get_image_base64(),
-                        "mimeType": f"image/{info['format'].lower()}"
-                    }
-                },
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "text",
-                        "text": "Please analyze this image and describe what you see."
-                    }
-                }
+                SamplingMessage(
+                    role="user",
+                    content=ImageContent(
+                        type="image",
+                        data=analyzer.get_image_base64(),
+                        mimeType=f"image/{info['format'].lower()}"
+                    )
+                ),
+                SamplingMessage(
+                    role="user",
+                    content=TextContent(
+                        type="text",
+                        text="Please analyze this image and describe what you see."
+                    )
+                )
             ]
             
             # Send request with separate parameters
@@ -1,6 +1,12 @@
 import asyncio
 import logging
+import queue
+import shlex
+import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import json
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 from mcp.types import Tool, TextContent
@@ -18,11 +24,107 @@ logger = logging.getLogger(__name__)
 # Create server instance
 server = Server("mac-control")
 
-def run_applescript(script: str) -> str:
-    """Run AppleScript and return its output."""
+# JXA worker kept alive by AppleScriptRunner: reads one JSON request per line,
+# {"source": ..., "args": [...], "cache": bool}, runs it with NSAppleScript and
+# answers with one JSON line. Args are handed to the script's run handler as
+# argv; cached scripts are compiled on first use and reused afterwards.
+OSA_WORKER = """
+ObjC.import('Foundation');
+var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+var compiled = {};
+// Turns non-text results (lists, numbers...) into text the way osascript prints them
+var formatter = $.NSAppleScript.alloc.initWithSource(
+    'on run {value}\\n' +
+    'set AppleScript\\'s text item delimiters to ", "\\n' +
+    'return value as text\\n' +
+    'end run');
+formatter.compileAndReturnError(null);
+function reply(obj) {
+    stdout.writeData($(JSON.stringify(obj) + '\\n').dataUsingEncoding($.NSUTF8StringEncoding));
+}
+function run(request) {
+    var error = Ref();
+    var script = request.cache ? compiled[request.source] : undefined;
+    if (script === undefined) {
+        script = $.NSAppleScript.alloc.initWithSource(request.source);
+        if (!script.compileAndReturnError(error)) {
+            return {error: ObjC.unwrap(error[0].objectForKey('NSAppleScriptErrorMessage'))};
+        }
+        if (request.cache) {
+            compiled[request.source] = script;
+        }
+    }
+    var result;
+    if (request.args.length) {
+        result = runWith(script, request.args.map(function (arg) {
+            return $.NSAppleEventDescriptor.descriptorWithString(arg);
+        }), error);
+    } else {
+        result = script.executeAndReturnError(error);
+    }
+    if (result.isNil()) {
+        return {error: ObjC.unwrap(error[0].objectForKey('NSAppleScriptErrorMessage'))};
+    }
+    return {output: asText(result)};
+}
+function runWith(script, items, error) {
+    // Same as osascript's argv: a run event ('aevt'/'oapp') with a list as direct object
+    var argv = $.NSAppleEventDescriptor.listDescriptor;
+    items.forEach(function (item, i) {
+        argv.insertDescriptorAtIndex(item, i + 1);
+    });
+    var event = $.NSAppleEventDescriptor.appleEventWithEventClassEventIDTargetDescriptorReturnIDTransactionID(
+        0x61657674, 0x6f617070, $.NSAppleEventDescriptor.nullDescriptor, -1, 0);
+    event.setParamDescriptorForKeyword(argv, 0x2d2d2d2d);
+    return script.executeAppleEventError(event, error);
+}
+function asText(result) {
+    // typeNull: the script returned nothing
+    if (result.descriptorType == 0x6e756c6c) return '';
+    var text = ObjC.unwrap(result.stringValue);
+    if (text != null) return text;
+    var formatted = runWith(formatter, [result], Ref());
+    return formatted.isNil() ? '' : (ObjC.unwrap(formatted.stringValue) || '');
+}
+var buffer = '';
+while (true) {
+    var data = stdin.availableData;
+    if (data.length == 0) break;
+    buffer += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    var nl;
+    while ((nl = buffer.indexOf('\\n')) >= 0) {
+        var request = JSON.parse(buffer.slice(0, nl));
+        buffer = buffer.slice(nl + 1);
+        reply(run(request));
+    }
+}
+"""
+
+# Fixed scripts for the built-in tools; user values are passed as argv, never
+# spliced into the source, so quotes in a message can't break the script
+NOTIFY_SCRIPT = """on run argv
+display notification (item 2 of argv) with title (item 1 of argv)
+end run"""
+VOLUME_SCRIPT = """on run argv
+set volume output volume ((item 1 of argv) as integer)
+end run"""
+
+# Characters that need /bin/sh to interpret them; anything else is exec'd directly
+SHELL_METACHARACTERS = set('|&;<>()$`\\"\'*?[]#~={}\n')
+
+# Scripts the worker compiles once and keeps; arbitrary user scripts aren't cached
+COMPILED_SCRIPTS = frozenset({NOTIFY_SCRIPT, VOLUME_SCRIPT})
+
+# Seconds to wait for the worker's reply before killing it; a script stuck on a
+# dialog would otherwise hold the runner's lock for every later call
+APPLESCRIPT_TIMEOUT = 60
+
+def _run_applescript_once(script: str, *argv: str) -> str:
+    """Run AppleScript in a fresh osascript process and return its output."""
     try:
         result = subprocess.run(
-            ['osascript', '-e', script],
+            ['osascript', '-e', script, '--', *argv],
             capture_output=True,
             text=True,
             check=True
@@ -32,12 +134,107 @@ def run_applescript(script: str) -> str:
         logger.error(f"AppleScript error: {e.stderr}")
         raise ValueError(f"AppleScript failed: {e.stderr}")
 
+def _read_lines(stream, lines: queue.Queue):
+    """Forward lines from a worker's stdout; None marks end of file."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+class AppleScriptRunner:
+    """Run scripts through one long-lived osascript process instead of spawning one per call"""
+    def __init__(self):
+        self._proc = None
+        self._replies = None
+        self._lock = threading.Lock()
+    
+    def _worker(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ['osascript', '-l', 'JavaScript', '-e', OSA_WORKER],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            # Lines are read on a thread so waiting for a reply can time out
+            self._replies = queue.Queue()
+            threading.Thread(
+                target=_read_lines, args=(self._proc.stdout, self._replies), daemon=True
+            ).start()
+        return self._proc
+    
+    def _reset(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc = None
+    
+    def run(self, script: str, *argv: str) -> str:
+        with self._lock:
+            try:
+                proc = self._worker()
+                # json.dumps escapes newlines and non-ASCII, one request per line
+                proc.stdin.write(json.dumps({
+                    "source": script,
+                    "args": argv,
+                    "cache": script in COMPILED_SCRIPTS
+                }) + '\n')
+                proc.stdin.flush()
+            except OSError as e:
+                # The script never reached a worker, so running it one-shot can't repeat it
+                logger.warning(f"osascript worker failed, running one-shot: {str(e)}")
+                self._reset()
+                return _run_applescript_once(script, *argv)
+            
+            try:
+                line = self._replies.get(timeout=APPLESCRIPT_TIMEOUT)
+                if line is None:
+                    raise OSError("osascript worker exited")
+                reply = json.loads(line)
+            except queue.Empty:
+                self._reset()
+                logger.error(f"AppleScript timed out after {APPLESCRIPT_TIMEOUT}s")
+                raise ValueError(f"AppleScript timed out after {APPLESCRIPT_TIMEOUT}s")
+            except (OSError, ValueError) as e:
+                # The script may have run already; report instead of running it again
+                self._reset()
+                logger.error(f"AppleScript error: {str(e)}")
+                raise ValueError(f"AppleScript failed: {str(e)}")
+        
+        if 'error' in reply:
+            logger.error(f"AppleScript error: {reply['error']}")
+            raise ValueError(f"AppleScript failed: {reply['error']}")
+        return reply['output'].strip()
+    
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=APPLESCRIPT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+
+applescript_runner = AppleScriptRunner()
+
+def run_applescript(script: str, *argv: str) -> str:
+    """Run AppleScript and return its output; argv goes to the script's run handler."""
+    return applescript_runner.run(script, *argv)
+
 def run_shell(command: str) -> str:
     """Run shell command and return its output."""
+    # Plain commands skip the extra /bin/sh fork and exec; builtins like cd,
+    # export or type aren't programs, so anything not on PATH still goes to the shell
+    argv = None
+    if command.strip() and SHELL_METACHARACTERS.isdisjoint(command):
+        argv = shlex.split(command)
+        if shutil.which(argv[0]) is None:
+            argv = None
+    use_shell = argv is None
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            command if use_shell else argv,
+            shell=use_shell,
             capture_output=True,
             text=True,
             check=True
@@ -46,6 +243,10 @@ def run_shell(command: str) -> str:
     except subprocess.CalledProcessError as e:
         logger.error(f"Shell command error: {e.stderr}")
         raise ValueError(f"Shell command failed: {e.stderr}")
+    except OSError as e:
+        # Without a shell, an exec failure (e.g. permission denied) raises instead of exiting 126
+        logger.error(f"Shell command error: {str(e)}")
+        raise ValueError(f"Shell command failed: {str(e)}")
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -117,26 +318,24 @@ async def list_tools() -> list[Tool]:
 @server.call_tool()
 async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     if name == "applescript":
-        output = run_applescript(arguments["script"])
+        output = await asyncio.to_thread(run_applescript, arguments["script"])
         return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
     
     elif name == "shell":
-        output = run_shell(arguments["command"])
+        output = await asyncio.to_thread(run_shell, arguments["command"])
         return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
     
     elif name == "volume":
-        script = f'set volume output volume {arguments["level"]}'
-        run_applescript(script)
+        await asyncio.to_thread(run_applescript, VOLUME_SCRIPT, str(arguments["level"]))
         return [TextContent(
             type="text",
             text=f"🔊 Volume set to {arguments['level']}%"
         )]
     
     elif name == "notification":
-        script = f'''
-        display notification "{arguments['message']}" with title "{arguments['title']}"
-        '''
-        run_applescript(script)
+        await asyncio.to_thread(
+            run_applescript, NOTIFY_SCRIPT, arguments['title'], arguments['message']
+        )
         return [TextContent(
             type="text",
             text=f"🔔 Notification sent: {arguments['title']}"
@@ -149,6 +348,11 @@ async def main():
     
     logger.debug("Starting mac-control server...")
     
+    # Subprocess calls run via to_thread; keep a small pool of reusable workers
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=4, thread_name_prefix="mac-control")
+    )
+    
     try:
         async with stdio_server() as (read_stream, write_stream):
             logger.debug("Server streams initialized")
@@ -167,6 +371,8 @@ async def main():
     except Exception as e:
         logger.error(f"Server error: {str(e)}", exc_info=True)
         raise
+    finally:
+        applescript_runner.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
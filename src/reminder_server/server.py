@@ -6,6 +6,7 @@ from mcp.server.models import InitializationOptions
 from mcp.types import Tool, TextContent
 from typing import Any, Sequence
 import json
+import itertools
 
 # Configure logging
 logging.basicConfig(
@@ -19,38 +20,69 @@ logger = logging.getLogger(__name__)
 # Create server instance
 server = Server("reminder-server")
 
+# Seconds to collect reminder changes into one notification
+NOTIFY_BATCH_WINDOW = 0.05
+
 class ReminderManager:
     def __init__(self, server: Server):
         self.server = server
-        self.reminders = {}  # task_id -> (task, end_time)
+        self.reminders = {}  # task_id -> (task, end_time, message)
+        # IDs are never reused, clients key their reminder lists on them
+        self._ids = itertools.count()
+        # Changes waiting for the dispatcher, sent as one JSON array per batch
+        self._changes = asyncio.Queue()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def notify(self, event: str, task_id: str, end_time: datetime, message: str):
+        """Push a reminder change so clients can track reminders without polling"""
+        self._changes.put_nowait({
+            "event": event,
+            "id": task_id,
+            "end_time": end_time.isoformat(),
+            "message": message
+        })
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self._changes.get()]
+            # Reminders firing together go out in a single stdout write
+            await asyncio.sleep(NOTIFY_BATCH_WINDOW)
+            while not self._changes.empty():
+                batch.append(self._changes.get_nowait())
+            try:
+                await self.server.notify_status(json.dumps(batch))
+            except Exception as e:
+                logger.error(f"Notification error: {str(e)}")
 
     async def add_reminder(self, minutes: int, message: str) -> str:
-        task_id = f"reminder_{len(self.reminders)}"
+        task_id = f"reminder_{next(self._ids)}"
         end_time = datetime.now() + timedelta(minutes=minutes)
         
         async def reminder_task():
             await asyncio.sleep(minutes * 60)
-            await self.server.notify_status(f"⏰ Reminder: {message}")
             del self.reminders[task_id]
+            await self.notify("fired", task_id, end_time, message)
         
-        self.reminders[task_id] = (asyncio.create_task(reminder_task()), end_time)
+        self.reminders[task_id] = (asyncio.create_task(reminder_task()), end_time, message)
+        await self.notify("added", task_id, end_time, message)
         return task_id
 
-    def list_active(self) -> list[tuple[str, datetime]]:
-        return [(tid, end_time) for tid, (_, end_time) in self.reminders.items()]
+    def list_active(self) -> list[tuple[str, datetime, str]]:
+        return [(tid, end_time, message) for tid, (_, end_time, message) in self.reminders.items()]
 
-    def cancel_reminder(self, task_id: str) -> bool:
+    async def cancel_reminder(self, task_id: str) -> bool:
         if task_id in self.reminders:
-            task, _ = self.reminders[task_id]
+            task, end_time, message = self.reminders.pop(task_id)
             task.cancel()
-            del self.reminders[task_id]
+            await self.notify("cancelled", task_id, end_time, message)
             return True
         return False
 
     def stop_all(self):
-        for task, _ in self.reminders.values():
+        for task, _, _ in self.reminders.values():
             task.cancel()
         self.reminders.clear()
+        self._dispatcher.cancel()
 
 # Global reminder manager
 reminder_mgr = None
@@ -93,7 +125,7 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="list_reminders",
-            description="List all active reminders",
+            description="List all active reminders as a JSON array of {id, end_time, seconds_left, message}",
             inputSchema={
                 "type": "object",
                 "properties": {}
@@ -117,7 +149,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     
     elif name == "cancel_reminder":
         task_id = arguments["task_id"]
-        if reminder_mgr.cancel_reminder(task_id):
+        if await reminder_mgr.cancel_reminder(task_id):
             return [TextContent(
                 type="text",
                 text=f"✅ Cancelled reminder: {task_id}"
@@ -129,28 +161,18 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             )]
     
     elif name == "list_reminders":
-        reminders = reminder_mgr.list_active()
-        if not reminders:
-            return [TextContent(
-                type="text",
-                text="No active reminders"
-            )]
-        
-        formatted_reminders = []
-        for rid, end_time in reminders:
-            time_left = (end_time - datetime.now()).total_seconds() / 60
-            if time_left < 1:
-                time_str = "Due any moment!"
-            elif time_left < 2:
-                time_str = "Due in 1 minute"
-            else:
-                time_str = f"Due in {int(time_left)} minutes"
-            
-            formatted_reminders.append(f"• {rid} ({time_str})")
+        # Structured payload; clients format the time left themselves
+        now = datetime.now()
+        reminders = [{
+            "id": rid,
+            "end_time": end_time.isoformat(),
+            "seconds_left": max(0.0, (end_time - now).total_seconds()),
+            "message": message
+        } for rid, end_time, message in reminder_mgr.list_active()]
         
         return [TextContent(
             type="text",
-            text="Active reminders:\n" + "\n".join(formatted_reminders)
+            text=json.dumps(reminders)
         )]
     
     raise ValueError(f"Unknown tool: {name}")
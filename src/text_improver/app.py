@@ -1,60 +1,87 @@
 import streamlit as st
 import asyncio
+import os
+import sys
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from concurrent.futures import ThreadPoolExecutor
-import time
+import threading
+import atexit
+
+# Launch the server with the interpreter running this client
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'text_improver', 'server.py')]
+)
+
+# Reconnect backoff bounds, in seconds
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Seconds close() waits for the session and server to shut down
+CLOSE_TIMEOUT = 5
 
 class TextImprover:
     def __init__(self):
         self.session = None
         self.loop = asyncio.new_event_loop()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)
         self.initialized = False
+        # Set (on the client loop) to close the session
+        self._closed = None
+        self._closing = False
         self._start_client()
+        # Close the session, and with it the server process, when the app exits
+        atexit.register(self.close)
     
     def _start_client(self):
-        self.thread_pool.submit(self._run_async_client)
+        # Daemon so a stuck session can't keep the process alive; close() joins it for up to CLOSE_TIMEOUT
+        self._thread = threading.Thread(target=self._run_async_client, daemon=True)
+        self._thread.start()
     
     def _run_async_client(self):
         asyncio.set_event_loop(self.loop)
         self.loop.run_until_complete(self._init_mcp())
     
+    def close(self):
+        """Close the MCP session and stop reconnecting"""
+        self._closing = True
+        if self._closed is not None:
+            self.loop.call_soon_threadsafe(self._closed.set)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(CLOSE_TIMEOUT)
+    
     async def _init_mcp(self):
-        server_params = StdioServerParameters(
-            command="/Users/aviz/my-first-mcp/.venv/bin/python",
-            args=["/Users/aviz/my-first-mcp/src/text_improver/server.py"]
-        )
-        
-        try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.session = session
-                    await session.initialize()
-                    self.initialized = True
-                    while True:
-                        await asyncio.sleep(0.1)
-        except Exception as e:
-            print(f"Connection error: {str(e)}")
+        self._closed = asyncio.Event()
+        delay = RECONNECT_MIN_DELAY
+        while not self._closing:
+            try:
+                async with stdio_client(SERVER_PARAMS) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        self.session = session
+                        await session.initialize()
+                        self.initialized = True
+                        delay = RECONNECT_MIN_DELAY
+                        
+                        # Park until close(); a dropped connection raises out of here
+                        await self._closed.wait()
+            except Exception as e:
+                print(f"Connection error: {str(e)}")
+            self.session = None
             self.initialized = False
-            await asyncio.sleep(5)
-            await self._init_mcp()
+            if self._closing:
+                break
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
     
     def improve_text(self, text: str, style: str) -> tuple[str, bool]:
         if not self.session or not self.initialized:
             return "System not ready", False
         
         try:
-            # Set text first
+            # Text and style go in a single call
             future = asyncio.run_coroutine_threadsafe(
-                self.session.call_tool("set_text", arguments={"text": text}),
-                self.loop
-            )
-            future.result(timeout=5)
-            
-            # Then get improvements
-            future = asyncio.run_coroutine_threadsafe(
-                self.session.call_tool("improve_text", arguments={"style": style}),
+                self.session.call_tool("improve", arguments={"text": text, "style": style}),
                 self.loop
             )
             result = future.result(timeout=30)
@@ -74,10 +101,17 @@ if 'improver' not in st.session_state:
 st.set_page_config(page_title="Text Improver", page_icon="✍️", layout="wide")
 st.title("✍️ AI Text Improver")
 
-# Connection status
-if not st.session_state.improver.initialized:
+# Connection status; only this fragment polls, not the whole page
+@st.fragment(run_every=1)
+def connection_status():
+    if st.session_state.improver.initialized:
+        # Rerun the whole page once so the button picks up the connection
+        st.rerun()
     st.warning("⏳ Connecting to system...")
 
+if not st.session_state.improver.initialized:
+    connection_status()
+
 # Text input
 text = st.text_area("Enter your text:", height=200)
 
@@ -101,9 +135,4 @@ if st.button("Improve Text", disabled=not st.session_state.improver.initialized
             st.markdown("### Improvements")
             st.markdown(improvements)
         else:
-            st.error(improvements)
-
-# Auto-refresh for connection status
-if not st.session_state.improver.initialized:
-    time.sleep(1)
-    st.rerun() 
\ No newline at end of file
+            st.error(improvements) 
\ No newline at end of file
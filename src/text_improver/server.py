@@ -2,7 +2,7 @@ import asyncio
 import logging
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
-from mcp.types import Tool, TextContent, SamplingMessage, SamplingContent
+from mcp.types import Tool, TextContent
 from typing import Any, Sequence
 
 logger = logging.getLogger(__name__)
@@ -28,96 +28,140 @@ class TextImprover:
 
 improver = TextImprover()
 
+# Tool listing is static, so it is built once at import
+TOOLS = [
+    Tool(
+        name="set_text",
+        description="Set text for improvement",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Text to improve"
+                }
+            },
+            "required": ["text"]
+        }
+    ),
+    Tool(
+        name="improve_text",
+        description="Get improvements for current text",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "style": {
+                    "type": "string",
+                    "description": "Improvement style (formal/creative/concise)",
+                    "enum": ["formal", "creative", "concise"]
+                }
+            },
+            "required": ["style"]
+        }
+    ),
+    Tool(
+        name="improve",
+        description="Get improvements for the given text in one call, without storing it",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Text to improve"
+                },
+                "style": {
+                    "type": "string",
+                    "description": "Improvement style (formal/creative/concise)",
+                    "enum": ["formal", "creative", "concise"]
+                }
+            },
+            "required": ["text", "style"]
+        }
+    )
+]
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="set_text",
-            description="Set text for improvement",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "Text to improve"
-                    }
-                },
-                "required": ["text"]
-            }
-        ),
-        Tool(
-            name="improve_text",
-            description="Get improvements for current text",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "style": {
-                        "type": "string",
-                        "description": "Improvement style (formal/creative/concise)",
-                        "enum": ["formal", "creative", "concise"]
-                    }
-                },
-                "required": ["style"]
-            }
-        )
-    ]
+    return TOOLS
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    global improver
-    
-    if name == "set_text":
-        text = arguments["text"]
-        improver.set_text(text)
-        return [TextContent(
-            type="text",
-            text=f"Text set for improvement ({len(text)} characters)"
-        )]
+async def _set_text(arguments: Any) -> Sequence[TextContent]:
+    text = arguments["text"]
+    improver.set_text(text)
+    return [TextContent(
+        type="text",
+        text=f"Text set for improvement ({len(text)} characters)"
+    )]
+
+async def _request_improvements(text: str, style: str) -> str:
+    """Ask the client's model for improvements to text"""
+    context = server.request_context
     
-    elif name == "improve_text":
-        if not improver.get_text():
-            return [TextContent(
-                type="text",
-                text="No text set for improvement"
-            )]
-        
-        style = arguments["style"]
-        context = server.request_context
-        
-        # Create sampling message using MCP types
-        message = SamplingMessage(
-            role="user",
-            content=SamplingContent(
-                type="text",
-                text=f"""Here's the text to improve:
+    # Same shape SamplingMessage.model_dump() produces, without building the model
+    message = {
+        "role": "user",
+        "content": {
+            "type": "text",
+            "text": f"""Here's the text to improve:
                 
-{improver.get_text()}
+{text}
 
 Please suggest improvements to make this text more {style}."""
-            )
-        )
-        
-        # Ask the client to run the model
-        result = await context.session.send_request(
-            "sampling/createMessage",
-            {
-                "messages": [message.model_dump()],
-                "systemPrompt": f"""You are a helpful writing assistant specializing in {style} writing.
+        }
+    }
+    
+    # Ask the client to run the model
+    result = await context.session.send_request(
+        "sampling/createMessage",
+        {
+            "messages": [message],
+            "systemPrompt": f"""You are a helpful writing assistant specializing in {style} writing.
 Focus on specific, actionable improvements. Format your response as a list of suggestions.""",
-                "includeContext": "thisServer",
-                "maxTokens": 1000
-            }
-        )
-        
-        # Store improvement
-        improver.add_improvement(result.content.text)
-        
+            "includeContext": "thisServer",
+            "maxTokens": 1000
+        }
+    )
+    
+    return result.content.text
+
+async def _improve_text(arguments: Any) -> Sequence[TextContent]:
+    if not improver.get_text():
         return [TextContent(
             type="text",
-            text=f"Improvements ({style}):\n\n{result.content.text}"
+            text="No text set for improvement"
         )]
     
-    raise ValueError(f"Unknown tool: {name}")
+    style = arguments["style"]
+    improvements = await _request_improvements(improver.get_text(), style)
+    
+    # Store improvement
+    improver.add_improvement(improvements)
+    
+    return [TextContent(
+        type="text",
+        text=f"Improvements ({style}):\n\n{improvements}"
+    )]
+
+async def _improve(arguments: Any) -> Sequence[TextContent]:
+    # Text and style in one round trip; nothing shared between clients is touched
+    style = arguments["style"]
+    improvements = await _request_improvements(arguments["text"], style)
+    return [TextContent(
+        type="text",
+        text=f"Improvements ({style}):\n\n{improvements}"
+    )]
+
+TOOL_HANDLERS = {
+    "set_text": _set_text,
+    "improve_text": _improve_text,
+    "improve": _improve,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -1,65 +1,110 @@
 import streamlit as st
 import asyncio
+import os
+import sys
 from datetime import datetime
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import json
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import collections
+
+# Launch the server with the interpreter running this client
+SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       'reminder_server', 'server.py')]
+)
+
+# Reconnect backoff bounds, in seconds
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Notifications kept for display; older ones are dropped as new ones arrive
+NOTIFICATION_HISTORY = 5
+
+# Seconds between reminder list refreshes; adding a reminder refreshes it at once
+REMINDER_REFRESH_INTERVAL = 10
+
+def format_time_left(seconds: float) -> str:
+    """Human-readable time until a reminder fires"""
+    minutes = seconds / 60
+    if minutes < 1:
+        return "Due any moment!"
+    elif minutes < 2:
+        return "Due in 1 minute"
+    return f"Due in {int(minutes)} minutes"
 
 class ReminderClient:
     def __init__(self):
         self.session = None
         self.loop = asyncio.new_event_loop()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)
         self.initialized = False
+        # Filled by the client loop, emptied by the Streamlit script via drain_notifications()
+        self._notifications_lock = threading.Lock()
+        self._notifications = collections.deque(maxlen=NOTIFICATION_HISTORY)
         self._start_client()
     
     def _start_client(self):
-        self.thread_pool.submit(self._run_async_client)
+        threading.Thread(target=self._run_async_client, daemon=True).start()
     
     def _run_async_client(self):
         asyncio.set_event_loop(self.loop)
         self.loop.run_until_complete(self._init_mcp())
     
     async def _init_mcp(self):
-        server_params = StdioServerParameters(
-            command="/Users/aviz/my-first-mcp/.venv/bin/python",
-            args=["/Users/aviz/my-first-mcp/src/reminder_server/server.py"]
-        )
-        
-        try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.session = session
-                    await session.initialize()
-                    self.initialized = True
-                    
-                    # Listen for notifications using the notification stream
-                    async for notification in session.notification_stream():
-                        try:
-                            if 'notifications' not in st.session_state:
-                                st.session_state.notifications = []
-                            
-                            # Extract message from notification
-                            message = None
-                            if hasattr(notification, 'params'):
-                                message = notification.params.get('message', str(notification))
-                            else:
-                                message = str(notification)
-                            
-                            st.session_state.notifications.append({
-                                'time': datetime.now().strftime("%H:%M:%S"),
-                                'message': message
-                            })
-                        except Exception as e:
-                            print(f"Notification processing error: {str(e)}")
-                            await asyncio.sleep(1)
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                async with stdio_client(SERVER_PARAMS) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        self.session = session
+                        await session.initialize()
+                        self.initialized = True
+                        delay = RECONNECT_MIN_DELAY
                         
-                        await asyncio.sleep(0.1)
-        except Exception as e:
-            print(f"Connection error: {str(e)}")
-            await asyncio.sleep(5)
-            await self._init_mcp()
+                        await self._read_notifications(session)
+            except Exception as e:
+                print(f"Connection error: {str(e)}")
+            self.session = None
+            self.initialized = False
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+    
+    async def _read_notifications(self, session):
+        # Only queues; a slow Streamlit rerun never holds up the MCP transport.
+        # Wakes only when the session's reader delivers a server message
+        async for notification in session.incoming_messages:
+            if isinstance(notification, Exception):
+                print(f"Notification error: {str(notification)}")
+                continue
+            try:
+                status = getattr(notification, 'status', None)
+                if status is None:
+                    status = str(notification)
+                
+                try:
+                    # The server batches reminder changes; only fired ones are shown
+                    messages = [f"⏰ Reminder: {change['message']}"
+                                for change in json.loads(status) if change.get('event') == 'fired']
+                except (TypeError, ValueError):
+                    messages = [status]
+                
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                with self._notifications_lock:
+                    self._notifications.extend(
+                        {'time': timestamp, 'message': message} for message in messages
+                    )
+            except Exception as e:
+                print(f"Notification processing error: {str(e)}")
+    
+    def drain_notifications(self) -> list:
+        """Notifications received since the last call"""
+        with self._notifications_lock:
+            notifications = list(self._notifications)
+            self._notifications.clear()
+        return notifications
     
     def add_reminder(self, minutes: int, message: str):
         if not self.session or not self.initialized:
@@ -97,19 +142,10 @@ class ReminderClient:
             if hasattr(result, 'content'):
                 for item in result.content:
                     if hasattr(item, 'text'):
-                        lines = item.text.split('\n')[1:]
-                        reminders = []
-                        for line in lines:
-                            if line.strip():
-                                parts = line.replace('•', '').strip().split(' (', 1)
-                                if len(parts) == 2:
-                                    rid = parts[0]
-                                    time_str = parts[1].rstrip(')')
-                                    reminders.append({
-                                        'id': rid,
-                                        'time': time_str
-                                    })
-                        return reminders
+                        return [{
+                            'id': reminder['id'],
+                            'time': format_time_left(reminder['seconds_left'])
+                        } for reminder in json.loads(item.text)]
             return []
         except Exception as e:
             print(f"Error listing reminders: {str(e)}")
@@ -128,10 +164,17 @@ if 'client' not in st.session_state:
 # App title
 st.title('⏰ Reminder Manager')
 
-# Connection status
-if not st.session_state.client.initialized:
+# Connection status; only this fragment polls, not the whole page
+@st.fragment(run_every=1)
+def connection_status():
+    if st.session_state.client.initialized:
+        # Rerun the whole page once so the reminder list is fetched
+        st.rerun()
     st.warning("⏳ Connecting to server...")
 
+if not st.session_state.client.initialized:
+    connection_status()
+
 # Add reminder section
 with st.form("new_reminder"):
     st.subheader("Add New Reminder")
@@ -150,21 +193,28 @@ with st.form("new_reminder"):
         else:
             st.error(msg)
 
-# Active reminders section
-st.subheader("Active Reminders")
-reminders = st.session_state.client.list_reminders()
-if reminders:
-    for reminder in reminders:
-        st.info(f"🔔 {reminder['id']} ({reminder['time']})")
-else:
-    st.write("No active reminders")
+# Active reminders section; refreshed slowly, the times only have minute precision
+@st.fragment(run_every=REMINDER_REFRESH_INTERVAL)
+def active_reminders():
+    st.subheader("Active Reminders")
+    reminders = st.session_state.client.list_reminders()
+    if reminders:
+        for reminder in reminders:
+            st.info(f"🔔 {reminder['id']} ({reminder['time']})")
+    else:
+        st.write("No active reminders")
+
+active_reminders()
 
 # Notifications section
-st.subheader("Notifications")
-if 'notifications' in st.session_state and st.session_state.notifications:
-    for notification in reversed(st.session_state.notifications[-5:]):  # Show last 5
-        st.success(f"[{notification['time']}] {notification['message']}")
+@st.fragment(run_every=1)
+def notifications():
+    st.subheader("Notifications")
+    if 'notifications' not in st.session_state:
+        st.session_state.notifications = collections.deque(maxlen=NOTIFICATION_HISTORY)
+    st.session_state.notifications.extend(st.session_state.client.drain_notifications())
+    if st.session_state.notifications:
+        for notification in reversed(st.session_state.notifications):
+            st.success(f"[{notification['time']}] {notification['message']}")
 
-# Auto-refresh
-st.empty()
-st.rerun()  # Use rerun() instead of experimental_rerun() 
\ No newline at end of file
+notifications()
@@ -1,6 +1,11 @@
 import asyncio
 import logging
+import queue
 import subprocess
+import threading
+import time
+import base64
+import uuid
 import ctypes
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
@@ -22,8 +27,84 @@ logger = logging.getLogger(__name__)
 # Create server instance
 server = Server("win-control")
 
-def run_powershell(script: str) -> str:
-    """Run PowerShell command and return its output."""
+# CoreAudio's IAudioEndpointVolume for the default output device, declared once
+# per PowerShell session; sets the level directly instead of sending ~100 volume keys
+VOLUME_TYPE = """
+if (-not ([System.Management.Automation.PSTypeName]'EndpointVolume').Type) {
+Add-Type -TypeDefinition @'
+using System;
+using System.Runtime.InteropServices;
+[Guid("5CDF2C82-841E-4546-9722-0CF74078229A"), InterfaceType(ComInterfaceType.InterfaceIsIUnknown)]
+interface IAudioEndpointVolume {
+    int f(); int g(); int h(); int i();
+    int SetMasterVolumeLevelScalar(float fLevel, Guid pguidEventContext);
+    int j();
+    int GetMasterVolumeLevelScalar(out float pfLevel);
+    int k(); int l(); int m(); int n();
+    int SetMute([MarshalAs(UnmanagedType.Bool)] bool bMute, Guid pguidEventContext);
+}
+[Guid("D666063F-1587-4E43-81F1-B948E807363F"), InterfaceType(ComInterfaceType.InterfaceIsIUnknown)]
+interface IMMDevice {
+    int Activate(ref Guid id, int clsCtx, int activationParams, out IAudioEndpointVolume aev);
+}
+[Guid("A95664D2-9614-4F35-A746-DE8DB63617E6"), InterfaceType(ComInterfaceType.InterfaceIsIUnknown)]
+interface IMMDeviceEnumerator {
+    int f();
+    int GetDefaultAudioEndpoint(int dataFlow, int role, out IMMDevice endpoint);
+}
+[ComImport, Guid("BCDE0395-E52F-467C-8E3D-C4579291692E")] class MMDeviceEnumeratorComObject { }
+public class EndpointVolume {
+    public static void Set(float level) {
+        var enumerator = new MMDeviceEnumeratorComObject() as IMMDeviceEnumerator;
+        IMMDevice device = null;
+        Marshal.ThrowExceptionForHR(enumerator.GetDefaultAudioEndpoint(0, 1, out device));
+        IAudioEndpointVolume volume = null;
+        var iid = typeof(IAudioEndpointVolume).GUID;
+        Marshal.ThrowExceptionForHR(device.Activate(ref iid, 23, 0, out volume));
+        Marshal.ThrowExceptionForHR(volume.SetMute(false, Guid.Empty));
+        Marshal.ThrowExceptionForHR(volume.SetMasterVolumeLevelScalar(level, Guid.Empty));
+    }
+}
+'@
+}
+"""
+
+# Toast notification helper, defined once per PowerShell session. Title and message
+# arrive as parameters and are XML-escaped, never spliced into the template
+NOTIFY_FUNCTION = """
+if (-not (Get-Command Show-Toast -ErrorAction SilentlyContinue)) {
+function global:Show-Toast([string]$Title, [string]$Message) {
+    [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
+    [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null
+    $titleXml = [System.Security.SecurityElement]::Escape($Title)
+    $messageXml = [System.Security.SecurityElement]::Escape($Message)
+    $template = @"
+    <toast>
+        <visual>
+            <binding template="ToastText02">
+                <text id="1">$titleXml</text>
+                <text id="2">$messageXml</text>
+            </binding>
+        </visual>
+    </toast>
+"@
+    $xml = New-Object Windows.Data.Xml.Dom.XmlDocument
+    $xml.LoadXml($template)
+    $toast = [Windows.UI.Notifications.ToastNotification]::new($xml)
+    [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Windows Control").Show($toast)
+}
+}
+"""
+
+def ps_quote(value: str) -> str:
+    """Quote a value as a PowerShell single-quoted (non-expanding) string literal."""
+    # PowerShell also treats typographic single quotes as quote characters
+    for quote in "'\u2018\u2019\u201a\u201b":
+        value = value.replace(quote, quote * 2)
+    return f"'{value}'"
+
+def _run_powershell_once(script: str) -> str:
+    """Run PowerShell command in a fresh process and return its output."""
     try:
         result = subprocess.run(
             ['powershell', '-Command', script],
@@ -36,6 +117,124 @@ def run_powershell(script: str) -> str:
         logger.error(f"PowerShell error: {e.stderr}")
         raise ValueError(f"PowerShell failed: {e.stderr}")
 
+# Seconds to wait for a script's output before killing the worker; a hung script
+# would otherwise hold the runner's lock for every later call
+POWERSHELL_TIMEOUT = 60
+
+def _read_lines(stream, lines: queue.Queue):
+    """Forward lines from a worker's stdout; None marks end of file."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+class PowerShellRunner:
+    """Run scripts through one long-lived PowerShell process instead of starting one per call"""
+    def __init__(self):
+        self._proc = None
+        self._lines = None
+        self._lock = threading.Lock()
+        # Marks the end of each reply; random so script output can't fake it
+        self._sentinel = f"__end_{uuid.uuid4().hex}__"
+    
+    def _worker(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ['powershell', '-NoProfile', '-NoLogo', '-NonInteractive', '-Command', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                encoding='utf-8',
+                bufsize=1
+            )
+            self._proc.stdin.write("[Console]::OutputEncoding = [Text.Encoding]::UTF8\n")
+            # Lines are read on a thread so waiting for output can time out
+            self._lines = queue.Queue()
+            threading.Thread(
+                target=_read_lines, args=(self._proc.stdout, self._lines), daemon=True
+            ).start()
+        return self._proc
+    
+    def _reset(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc = None
+    
+    def _request(self, script: str) -> str:
+        # -Command - runs stdin line by line, so each script is sent as one base64 line.
+        # It runs in its own scope with the location restored afterwards, so variables
+        # and Set-Location don't carry over into unrelated calls
+        # Errors are merged into the output (2>&1): a non-terminating cmdlet error or a
+        # native exe's non-zero exit reports failure with its text, as the one-shot
+        # process's exit code did. Native stderr alone doesn't count as a failure.
+        encoded = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        return (
+            "& { Push-Location; try { "
+            "$global:LASTEXITCODE = 0; "
+            "$out = & ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString("
+            f"[Convert]::FromBase64String('{encoded}')))) 2>&1; "
+            "$failed = $global:LASTEXITCODE -ne 0 -or @($out | Where-Object { "
+            "$_ -is [System.Management.Automation.ErrorRecord] -and "
+            "$_.FullyQualifiedErrorId -notlike 'NativeCommandError*' }).Count -gt 0; "
+            "[Console]::Out.WriteLine(($out | Out-String)); "
+            f"if ($failed) {{ [Console]::Out.WriteLine('{self._sentinel}error') }} "
+            f"else {{ [Console]::Out.WriteLine('{self._sentinel}ok') }} "
+            "} catch { "
+            f"[Console]::Out.WriteLine($_.Exception.Message); [Console]::Out.WriteLine('{self._sentinel}error') "
+            "} finally { Pop-Location } }\n"
+        )
+    
+    def run(self, script: str) -> str:
+        with self._lock:
+            try:
+                proc = self._worker()
+                proc.stdin.write(self._request(script))
+                proc.stdin.flush()
+            except OSError as e:
+                # The script never reached a worker, so running it one-shot can't repeat it
+                logger.warning(f"PowerShell worker failed, running one-shot: {str(e)}")
+                self._reset()
+                return _run_powershell_once(script)
+            
+            lines = []
+            deadline = time.monotonic() + POWERSHELL_TIMEOUT
+            while True:
+                try:
+                    line = self._lines.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._reset()
+                    logger.error(f"PowerShell timed out after {POWERSHELL_TIMEOUT}s")
+                    raise ValueError(f"PowerShell timed out after {POWERSHELL_TIMEOUT}s")
+                if line is None:
+                    # e.g. the script called exit; it may have done its work, don't run it again
+                    self._reset()
+                    logger.error("PowerShell worker exited during the script")
+                    raise ValueError("PowerShell failed: the PowerShell process exited")
+                if line.startswith(self._sentinel):
+                    status = line[len(self._sentinel):].strip()
+                    break
+                lines.append(line)
+        
+        output = "".join(lines).strip()
+        if status == "error":
+            logger.error(f"PowerShell error: {output}")
+            raise ValueError(f"PowerShell failed: {output}")
+        return output
+    
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=POWERSHELL_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+
+powershell_runner = PowerShellRunner()
+
+def run_powershell(script: str) -> str:
+    """Run PowerShell command and return its output."""
+    return powershell_runner.run(script)
+
 def run_cmd(command: str) -> str:
     """Run CMD command and return its output."""
     try:
@@ -51,170 +250,164 @@ def run_cmd(command: str) -> str:
         logger.error(f"CMD error: {e.stderr}")
         raise ValueError(f"CMD failed: {e.stderr}")
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="powershell",
-            description="Run PowerShell command",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script": {
-                        "type": "string",
-                        "description": "PowerShell command to execute"
-                    }
-                },
-                "required": ["script"]
-            }
-        ),
-        Tool(
-            name="cmd",
-            description="Run CMD command",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "CMD command to execute"
-                    }
-                },
-                "required": ["command"]
-            }
-        ),
-        Tool(
-            name="volume",
-            description="Control system volume",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "level": {
-                        "type": "integer",
-                        "description": "Volume level (0-100)",
-                        "minimum": 0,
-                        "maximum": 100
-                    }
-                },
-                "required": ["level"]
-            }
-        ),
-        Tool(
-            name="notification",
-            description="Send system notification",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Notification title"
-                    },
-                    "message": {
-                        "type": "string",
-                        "description": "Notification message"
-                    }
+# Tool listing is static, so it is built once at import
+TOOLS = [
+    Tool(
+        name="powershell",
+        description="Run PowerShell command",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "script": {
+                    "type": "string",
+                    "description": "PowerShell command to execute"
+                }
+            },
+            "required": ["script"]
+        }
+    ),
+    Tool(
+        name="cmd",
+        description="Run CMD command",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "CMD command to execute"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    Tool(
+        name="volume",
+        description="Control system volume",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "level": {
+                    "type": "integer",
+                    "description": "Volume level (0-100)",
+                    "minimum": 0,
+                    "maximum": 100
+                }
+            },
+            "required": ["level"]
+        }
+    ),
+    Tool(
+        name="notification",
+        description="Send system notification",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Notification title"
                 },
-                "required": ["title", "message"]
-            }
-        ),
-        Tool(
-            name="lock",
-            description="Lock Windows",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="screenshot",
-            description="Take a screenshot",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Save path (optional)",
-                        "default": str(Path.home() / "Pictures" / "screenshot.png")
-                    }
+                "message": {
+                    "type": "string",
+                    "description": "Notification message"
+                }
+            },
+            "required": ["title", "message"]
+        }
+    ),
+    Tool(
+        name="lock",
+        description="Lock Windows",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="screenshot",
+        description="Take a screenshot",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Save path (optional)",
+                    "default": str(Path.home() / "Pictures" / "screenshot.png")
                 }
             }
-        )
-    ]
+        }
+    )
+]
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    return TOOLS
+
+async def _powershell(arguments: Any) -> Sequence[TextContent]:
+    output = run_powershell(arguments["script"])
+    return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
+
+async def _cmd(arguments: Any) -> Sequence[TextContent]:
+    output = run_cmd(arguments["command"])
+    return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
+
+async def _volume(arguments: Any) -> Sequence[TextContent]:
+    script = VOLUME_TYPE + f"[EndpointVolume]::Set({int(arguments['level']) / 100})"
+    run_powershell(script)
+    return [TextContent(
+        type="text",
+        text=f"🔊 Volume set to {arguments['level']}%"
+    )]
+
+async def _notification(arguments: Any) -> Sequence[TextContent]:
+    script = NOTIFY_FUNCTION + (
+        f"Show-Toast -Title {ps_quote(arguments['title'])} -Message {ps_quote(arguments['message'])}"
+    )
+    run_powershell(script)
+    return [TextContent(
+        type="text",
+        text=f"🔔 Notification sent: {arguments['title']}"
+    )]
+
+async def _lock(arguments: Any) -> Sequence[TextContent]:
+    ctypes.windll.user32.LockWorkStation()
+    return [TextContent(
+        type="text",
+        text="🔒 Windows locked"
+    )]
+
+async def _screenshot(arguments: Any) -> Sequence[TextContent]:
+    save_path = arguments.get("path", str(Path.home() / "Pictures" / "screenshot.png"))
+    script = f'''
+    Add-Type -AssemblyName System.Windows.Forms
+    $screen = [System.Windows.Forms.Screen]::PrimaryScreen.Bounds
+    $bitmap = New-Object System.Drawing.Bitmap $screen.Width, $screen.Height
+    $graphics = [System.Drawing.Graphics]::FromImage($bitmap)
+    $graphics.CopyFromScreen($screen.Location, [System.Drawing.Point]::Empty, $screen.Size)
+    $bitmap.Save({ps_quote(save_path)})
+    $graphics.Dispose()
+    $bitmap.Dispose()
+    '''
+    run_powershell(script)
+    return [TextContent(
+        type="text",
+        text=f"📸 Screenshot saved to: {save_path}"
+    )]
+
+TOOL_HANDLERS = {
+    "powershell": _powershell,
+    "cmd": _cmd,
+    "volume": _volume,
+    "notification": _notification,
+    "lock": _lock,
+    "screenshot": _screenshot,
+}
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
-    if name == "powershell":
-        output = run_powershell(arguments["script"])
-        return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
-    
-    elif name == "cmd":
-        output = run_cmd(arguments["command"])
-        return [TextContent(type="text", text=f"✅ Done!\nOutput: {output}")]
-    
-    elif name == "volume":
-        script = f'''
-        $obj = New-Object -ComObject WScript.Shell
-        $obj.SendKeys([char]174 * 50)  # Mute first
-        $obj.SendKeys([char]175 * {int(arguments["level"] / 2)})  # Then set volume
-        '''
-        run_powershell(script)
-        return [TextContent(
-            type="text",
-            text=f"🔊 Volume set to {arguments['level']}%"
-        )]
-    
-    elif name == "notification":
-        script = f'''
-        [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
-        [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null
-
-        $template = @"
-        <toast>
-            <visual>
-                <binding template="ToastText02">
-                    <text id="1">{arguments['title']}</text>
-                    <text id="2">{arguments['message']}</text>
-                </binding>
-            </visual>
-        </toast>
-"@
-
-        $xml = New-Object Windows.Data.Xml.Dom.XmlDocument
-        $xml.LoadXml($template)
-        $toast = [Windows.UI.Notifications.ToastNotification]::new($xml)
-        [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Windows Control").Show($toast)
-        '''
-        run_powershell(script)
-        return [TextContent(
-            type="text",
-            text=f"🔔 Notification sent: {arguments['title']}"
-        )]
-    
-    elif name == "lock":
-        ctypes.windll.user32.LockWorkStation()
-        return [TextContent(
-            type="text",
-            text="🔒 Windows locked"
-        )]
-    
-    elif name == "screenshot":
-        save_path = arguments.get("path", str(Path.home() / "Pictures" / "screenshot.png"))
-        script = f'''
-        Add-Type -AssemblyName System.Windows.Forms
-        $screen = [System.Windows.Forms.Screen]::PrimaryScreen.Bounds
-        $bitmap = New-Object System.Drawing.Bitmap $screen.Width, $screen.Height
-        $graphics = [System.Drawing.Graphics]::FromImage($bitmap)
-        $graphics.CopyFromScreen($screen.Location, [System.Drawing.Point]::Empty, $screen.Size)
-        $bitmap.Save('{save_path}')
-        $graphics.Dispose()
-        $bitmap.Dispose()
-        '''
-        run_powershell(script)
-        return [TextContent(
-            type="text",
-            text=f"📸 Screenshot saved to: {save_path}"
-        )]
-    
-    raise ValueError(f"Unknown tool: {name}")
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -239,6 +432,8 @@ async def main():
     except Exception as e:
         logger.error(f"Server error: {str(e)}", exc_info=True)
         raise
+    finally:
+        powershell_runner.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file